@@ -4,16 +4,22 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
 import os
+import gc
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 from models import ReconConfig, ReconResult
-from recon_engine import ReconEngine
+from recon_engine import ReconEngine, compile_patterns
 from exporter import Exporter
+from base_tool import VirtualTreeAdapter, replace_rows
 
 
 class ReconApp:
     """Main application window for reconciliation tool."""
     
+    MAX_CSV_BYTES = 2 * 1024 ** 3        # Ask before loading files larger than this
+    ON_DISK_CSV_BYTES = 500 * 1024 ** 2  # Stage files larger than this in an on-disk database
+    
     def __init__(self, root: tk.Tk):
         """Initialize the application."""
         self.root = root
@@ -49,10 +55,36 @@ class ReconApp:
         self.total_b_var = tk.StringVar(value="--")
         self.temp_engine = None  # Keep engine alive for totals calculation
         
+        # Files already ingested into temp_engine, keyed by (path, mtime, size)
+        self._ingest_cache: Dict[Tuple[str, int, int], str] = {}
+        self._cleaned_columns: Dict[str, str] = {}  # temp table -> auto-cleaned amount column
+        
+        # Peeked (columns, rows) per file, and column sums per temp table
+        self._preview_cache: Dict[Tuple[str, int, int], Tuple[list, list]] = {}
+        self._sum_cache: Dict[Tuple[str, str], object] = {}
+        
+        # Pending debounced callbacks (root.after ids)
+        self._load_after_id = None
+        self._totals_after_id = None
+        
+        # Background column loads: latest generation wins, lock guards temp_engine
+        self._load_generation = 0
+        self._temp_lock = threading.Lock()
+        self._confirmed_large_files = set()  # File keys the user agreed to load despite size
+        
         # Auto-detection patterns
         self.date_patterns = ["date", "dt", "trans_date", "posting"]
         self.amount_patterns = ["amount", "amt", "value", "total", "sum"]
         self.desc_patterns = ["description", "desc", "narration", "memo", "reference"]
+        self._date_re = compile_patterns(self.date_patterns)
+        self._amount_re = compile_patterns(self.amount_patterns)
+        self._desc_re = compile_patterns(self.desc_patterns)
+        
+        # Last columns configured per treeview (see _populate_tree)
+        self._tree_columns: Dict[str, tuple] = {}
+        
+        # Row values by treeview and item id, so copying a cell skips the Tcl round-trip
+        self._row_values: Dict[str, Dict[str, tuple]] = {}
         
         # Context menu for copying
         self.context_menu = None
@@ -126,8 +158,8 @@ class ReconApp:
         self.amount_col_b_combo.grid(row=2, column=2, padx=5, pady=2)
         
         # Bind amount column changes to update totals
-        self.amount_col_a_combo.bind("<<ComboboxSelected>>", self._update_totals)
-        self.amount_col_b_combo.bind("<<ComboboxSelected>>", self._update_totals)
+        self.amount_col_a_combo.bind("<<ComboboxSelected>>", self._schedule_update_totals)
+        self.amount_col_b_combo.bind("<<ComboboxSelected>>", self._schedule_update_totals)
         
         # Amount totals row
         ttk.Label(col_frame, text="Total:", font=("", 8)).grid(row=3, column=0, sticky="w", pady=1)
@@ -196,6 +228,7 @@ class ReconApp:
         self.notebook.pack(fill=tk.BOTH, expand=True)
         
         self.tab_trees = {}
+        self.tab_adapters = {}
         tab_configs = [
             ("exact_matches", "Exact Matches"),
             ("matches_with_date_note", "Date Notes"),
@@ -212,10 +245,11 @@ class ReconApp:
             tree_frame = ttk.Frame(frame)
             tree_frame.pack(fill=tk.BOTH, expand=True)
             
+            # Vertical scrolling is handled by the adapter, which only renders visible rows
             tree = ttk.Treeview(tree_frame, show="headings")
-            vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+            vsb = ttk.Scrollbar(tree_frame, orient="vertical")
             hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
-            tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+            tree.configure(xscrollcommand=hsb.set)
             
             # Right-click to copy
             tree.bind("<Button-3>", lambda e, t=tree: self._show_context_menu(e, t))
@@ -228,6 +262,9 @@ class ReconApp:
             tree_frame.grid_columnconfigure(0, weight=1)
             
             self.tab_trees[table_name] = tree
+            self.tab_adapters[table_name] = VirtualTreeAdapter(
+                tree, vsb, self._row_values.setdefault(str(tree), {})
+            )
         
         # Create context menu (not a visual element)
         self.context_menu = tk.Menu(self.root, tearoff=0)
@@ -241,7 +278,7 @@ class ReconApp:
         )
         if path:
             self.source_a_var.set(path)
-            self._load_columns()
+            self._schedule_load_columns()
     
     def _browse_source_b(self):
         """Browse for Source B file."""
@@ -251,7 +288,29 @@ class ReconApp:
         )
         if path:
             self.source_b_var.set(path)
-            self._load_columns()
+            self._schedule_load_columns()
+    
+    def _schedule_load_columns(self, delay_ms: int = 300):
+        """Load columns after a short delay, coalescing rapid path changes into one load."""
+        if self._load_after_id:
+            self.root.after_cancel(self._load_after_id)
+        self._load_after_id = self.root.after(delay_ms, self._run_scheduled_load)
+    
+    def _run_scheduled_load(self):
+        """Run the pending column load."""
+        self._load_after_id = None
+        self._load_columns()
+    
+    def _schedule_update_totals(self, event=None, delay_ms: int = 300):
+        """Recalculate totals after a short delay, coalescing bursts of combobox changes."""
+        if self._totals_after_id:
+            self.root.after_cancel(self._totals_after_id)
+        self._totals_after_id = self.root.after(delay_ms, lambda: self._run_scheduled_totals(event))
+    
+    def _run_scheduled_totals(self, event=None):
+        """Run the pending totals update."""
+        self._totals_after_id = None
+        self._update_totals(event)
     
     def _show_context_menu(self, event, tree):
         """Show context menu for copying cell value."""
@@ -280,7 +339,9 @@ class ReconApp:
         
         # Get the row values
         item = selection[0]
-        values = self.context_tree.item(item, 'values')
+        values = self._row_values.get(str(self.context_tree), {}).get(item)
+        if values is None:
+            values = self.context_tree.item(item, 'values')
         
         if values and 0 <= col_index < len(values):
             value = str(values[col_index])
@@ -295,137 +356,405 @@ class ReconApp:
             self.output_dir_var.set(path)
     
     def _load_columns(self):
-        """Load column names from CSV files and auto-detect column mappings."""
-        if self.source_a_var.get() and self.source_b_var.get():
+        """Load column names from CSV files and auto-detect mappings in the background."""
+        if not (self.source_a_var.get() and self.source_b_var.get()):
+            return
+        
+        # Newer loads supersede older ones; stale results are discarded on apply
+        self._load_generation += 1
+        generation = self._load_generation
+        path_a = self.source_a_var.get()
+        path_b = self.source_b_var.get()
+        auto_clean = self.auto_clean_var.get()
+        
+        if not self._confirm_file_sizes(path_a, path_b):
+            self.status_var.set("Load cancelled")
+            return
+        on_disk = self._needs_on_disk(path_a, path_b)
+        
+        self.status_var.set("Loading columns...")
+        
+        def worker():
             try:
-                # Close previous engine if exists
-                if self.temp_engine:
-                    self.temp_engine.close()
-                
-                # Create engine to read headers (keep alive for totals)
-                self.temp_engine = ReconEngine()
-                self.columns_a = self.temp_engine.load_csv(self.source_a_var.get(), "temp_a")
-                self.columns_b = self.temp_engine.load_csv(self.source_b_var.get(), "temp_b")
-                
-                # Populate all dropdowns
-                self.date_col_a_combo['values'] = self.columns_a
-                self.date_col_b_combo['values'] = self.columns_b
-                self.amount_col_a_combo['values'] = self.columns_a
-                self.amount_col_b_combo['values'] = self.columns_b
-                self.desc_col_a_combo['values'] = ["(None)"] + self.columns_a
-                self.desc_col_b_combo['values'] = ["(None)"] + self.columns_b
-                
-                # Auto-detect columns using patterns
-                detected_date_a = self.temp_engine.detect_column("temp_a", self.date_patterns)
-                detected_date_b = self.temp_engine.detect_column("temp_b", self.date_patterns)
-                detected_amount_a = self.temp_engine.detect_column("temp_a", self.amount_patterns)
-                detected_amount_b = self.temp_engine.detect_column("temp_b", self.amount_patterns)
-                detected_desc_a = self.temp_engine.detect_column("temp_a", self.desc_patterns)
-                detected_desc_b = self.temp_engine.detect_column("temp_b", self.desc_patterns)
-                
-                # Set detected values (or first column as fallback)
-                self.date_col_a_var.set(detected_date_a or (self.columns_a[0] if self.columns_a else ""))
-                self.date_col_b_var.set(detected_date_b or (self.columns_b[0] if self.columns_b else ""))
-                self.amount_col_a_var.set(detected_amount_a or (self.columns_a[1] if len(self.columns_a) > 1 else ""))
-                self.amount_col_b_var.set(detected_amount_b or (self.columns_b[1] if len(self.columns_b) > 1 else ""))
-                self.desc_col_a_var.set(detected_desc_a or "(None)")
-                self.desc_col_b_var.set(detected_desc_b or "(None)")
+                result = self._load_columns_worker(path_a, path_b, on_disk)
+            except Exception as e:
+                self.root.after(0, lambda e=e: self._load_columns_failed(generation, e))
+                return
+            self.root.after(0, lambda: self._load_columns_apply(generation, result))
+            
+            # The preview is up; ingest the full files for the totals unless
+            # a newer load has already started
+            if generation != self._load_generation:
+                return
+            amount_a, amount_b = result["amount_a"], result["amount_b"]
+            totals = self._load_totals_worker(path_a, path_b, auto_clean, amount_a, amount_b)
+            self.root.after(0, lambda: self._load_totals_apply(generation, amount_a, amount_b, totals))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _load_columns_worker(self, path_a: str, path_b: str, on_disk: bool) -> dict:
+        """
+        Read headers and preview rows and detect columns (no Tk access).
+        
+        Args:
+            path_a: Source A CSV path
+            path_b: Source B CSV path
+            on_disk: Whether the files need an on-disk engine
+            
+        Returns:
+            Dict of columns, preview rows and detected columns
+        """
+        with self._temp_lock:
+            # Move to an on-disk engine once a file is too large for memory
+            if self.temp_engine and on_disk and not self.temp_engine.on_disk:
+                self.temp_engine.close()
+                self.temp_engine = None
+                self._ingest_cache.clear()
+                self._cleaned_columns.clear()
+                self._sum_cache.clear()
+            
+            # Read only headers and a few sample rows for the preview
+            if not self.temp_engine:
+                self.temp_engine = ReconEngine(on_disk=on_disk)
+            columns_a, rows_a = self._peek(path_a)
+            columns_b, rows_b = self._peek(path_b)
+            
+            # Auto-detect columns using patterns (or fall back to position)
+            date_a = ReconEngine.match_column(columns_a, self._date_re) or (columns_a[0] if columns_a else "")
+            date_b = ReconEngine.match_column(columns_b, self._date_re) or (columns_b[0] if columns_b else "")
+            amount_a = ReconEngine.match_column(columns_a, self._amount_re) or (columns_a[1] if len(columns_a) > 1 else "")
+            amount_b = ReconEngine.match_column(columns_b, self._amount_re) or (columns_b[1] if len(columns_b) > 1 else "")
+            desc_a = ReconEngine.match_column(columns_a, self._desc_re) or "(None)"
+            desc_b = ReconEngine.match_column(columns_b, self._desc_re) or "(None)"
+        
+        return {
+            "columns_a": columns_a, "columns_b": columns_b,
+            "rows_a": rows_a, "rows_b": rows_b,
+            "date_a": date_a, "date_b": date_b,
+            "amount_a": amount_a, "amount_b": amount_b,
+            "desc_a": desc_a, "desc_b": desc_b,
+        }
+    
+    def _load_totals_worker(self, path_a: str, path_b: str, auto_clean: bool,
+                            amount_a: str, amount_b: str) -> list:
+        """
+        Ingest both files and sum the detected amount columns (no Tk access).
+        
+        Args:
+            path_a: Source A CSV path
+            path_b: Source B CSV path
+            auto_clean: Whether to clean the detected amount columns
+            amount_a: Detected amount column of source A
+            amount_b: Detected amount column of source B
+            
+        Returns:
+            Totals for A and B as returned by _column_sums
+        """
+        with self._temp_lock:
+            if not self.temp_engine:
+                return [None, None]  # Released while the preview was applied
+            try:
+                # Totals need the full data; the ingested tables are reused by the run
+                self._ingest({"temp_a": path_a, "temp_b": path_b})
                 
                 # Auto-clean amount columns if enabled
-                if self.auto_clean_var.get():
-                    amount_a = self.amount_col_a_var.get()
-                    amount_b = self.amount_col_b_var.get()
-                    if amount_a:
-                        self.temp_engine.clean_amount_column("temp_a", amount_a)
-                    if amount_b:
-                        self.temp_engine.clean_amount_column("temp_b", amount_b)
-                
-                # Calculate initial totals
-                self._update_totals()
-                
-                # Match key - common columns only
-                common = [c for c in self.columns_a if c in self.columns_b]
-                self.match_key_combo['values'] = common
-                
-                if common:
-                    self.match_key_var.set(common[0])
-                
-                # Update previews
-                self._update_preview()
-                    
-                self.status_var.set(f"Loaded: {len(self.columns_a)} cols from A, {len(self.columns_b)} cols from B (auto-detected)")
+                if auto_clean:
+                    self._clean_temp_amount("temp_a", amount_a)
+                    self._clean_temp_amount("temp_b", amount_b)
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to read CSV headers: {e}")
+                return [e, e]
+            
+            return self._column_sums([("temp_a", amount_a), ("temp_b", amount_b)])
     
-    def _update_preview(self):
-        """Update file preview tables with first 3 rows."""
-        if not self.temp_engine:
+    def _load_columns_apply(self, generation: int, result: dict):
+        """Apply loaded columns to the widgets (UI thread)."""
+        if generation != self._load_generation:
             return
         
+        self.columns_a = result["columns_a"]
+        self.columns_b = result["columns_b"]
+        
+        # Populate all dropdowns
+        self.date_col_a_combo['values'] = self.columns_a
+        self.date_col_b_combo['values'] = self.columns_b
+        self.amount_col_a_combo['values'] = self.columns_a
+        self.amount_col_b_combo['values'] = self.columns_b
+        self.desc_col_a_combo['values'] = ["(None)"] + self.columns_a
+        self.desc_col_b_combo['values'] = ["(None)"] + self.columns_b
+        
+        # Set detected values
+        self.date_col_a_var.set(result["date_a"])
+        self.date_col_b_var.set(result["date_b"])
+        self.amount_col_a_var.set(result["amount_a"])
+        self.amount_col_b_var.set(result["amount_b"])
+        self.desc_col_a_var.set(result["desc_a"])
+        self.desc_col_b_var.set(result["desc_b"])
+        
+        # Match key - common columns only
+        common = [c for c in self.columns_a if c in self.columns_b]
+        self.match_key_combo['values'] = common
+        
+        if common:
+            self.match_key_var.set(common[0])
+        
+        # Update previews; totals follow once the files are ingested
+        self._update_preview(result["rows_a"], result["rows_b"])
+        self.total_a_var.set("Calculating...")
+        self.total_b_var.set("Calculating...")
+        
+        self.status_var.set(f"Loaded: {len(self.columns_a)} cols from A, {len(self.columns_b)} cols from B (auto-detected)")
+    
+    def _load_totals_apply(self, generation: int, amount_a: str, amount_b: str, totals: list):
+        """Show the totals computed after a column load (UI thread)."""
+        if generation != self._load_generation:
+            return
+        
+        # The user picked other amount columns while the files were ingested
+        if (self.amount_col_a_var.get(), self.amount_col_b_var.get()) != (amount_a, amount_b):
+            self._update_totals()
+            return
+        
+        total_a, total_b = totals
+        self._set_total(self.total_a_var, amount_a, total_a)
+        self._set_total(self.total_b_var, amount_b, total_b)
+    
+    def _load_columns_failed(self, generation: int, error: Exception):
+        """Report a failed column load (UI thread)."""
+        if generation != self._load_generation:
+            return
+        self.status_var.set("Failed to read CSV headers")
+        messagebox.showerror("Error", f"Failed to read CSV headers: {error}")
+    
+    def _confirm_file_sizes(self, *paths: str) -> bool:
+        """
+        Ask before loading files above MAX_CSV_BYTES (once per file version).
+        
+        Returns:
+            True if loading should go ahead
+        """
+        for path in paths:
+            try:
+                key = self._file_key(path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Cannot read {path}: {e}")
+                return False
+            size = key[2]
+            if size <= self.MAX_CSV_BYTES or key in self._confirmed_large_files:
+                continue
+            if not messagebox.askyesno(
+                "Large File",
+                f"{os.path.basename(path)} is {size / 1024 ** 3:.1f} GB.\n\n"
+                "It will be staged in a temporary database on disk, which can take "
+                "a long time and needs free disk space of a similar size.\n\nContinue?"
+            ):
+                return False
+            self._confirmed_large_files.add(key)
+        return True
+    
+    def _needs_on_disk(self, *paths: str) -> bool:
+        """Check whether any file is large enough to stage on disk rather than in memory."""
         try:
-            # Preview Source A
-            if self.columns_a:
-                self.preview_a_tree.delete(*self.preview_a_tree.get_children())
-                self.preview_a_tree["columns"] = self.columns_a
-                for col in self.columns_a:
-                    self.preview_a_tree.heading(col, text=col)
-                    self.preview_a_tree.column(col, width=100, minwidth=50)
-                
-                # Select columns explicitly in order to match header order
-                cols_a_str = ", ".join([f'"{c}"' for c in self.columns_a])
-                rows_a = self.temp_engine.conn.execute(f"SELECT {cols_a_str} FROM temp_a LIMIT 3").fetchall()
-                for row in rows_a:
-                    self.preview_a_tree.insert("", tk.END, values=row)
+            return any(os.path.getsize(p) > self.ON_DISK_CSV_BYTES for p in paths)
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _file_key(path: str) -> Tuple[str, int, int]:
+        """Identify a file's current contents by path, modification time and size."""
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+    
+    def _peek(self, path: str) -> Tuple[list, list]:
+        """Peek a CSV's header and preview rows, reusing the result while the file is unchanged."""
+        key = self._file_key(path)
+        if key not in self._preview_cache:
+            if len(self._preview_cache) >= 8:
+                self._preview_cache.pop(next(iter(self._preview_cache)))
+            self._preview_cache[key] = self.temp_engine.peek_csv(path, 3)
+        return self._preview_cache[key]
+    
+    def _ingest(self, files: Dict[str, str]):
+        """
+        Load CSVs into the temp engine, skipping files already loaded unchanged.
+        
+        Args:
+            files: Mapping of temp table name to CSV path
+        """
+        pending = {}
+        for table_name, path in files.items():
+            key = self._file_key(path)
+            if self._ingest_cache.get(key) == table_name:
+                continue
             
-            # Preview Source B
+            # Forget whatever file this table held before
+            self._ingest_cache = {k: v for k, v in self._ingest_cache.items() if v != table_name}
+            self._cleaned_columns.pop(table_name, None)
+            self._invalidate_sums(table_name)
+            pending[table_name] = (path, key)
+        
+        if not pending:
+            return
+        self.temp_engine.load_csvs({table_name: path for table_name, (path, _) in pending.items()})
+        for table_name, (_, key) in pending.items():
+            self._ingest_cache[key] = table_name
+    
+    def _clean_temp_amount(self, table_name: str, column: str):
+        """Auto-clean a temp table's amount column unless it was already cleaned."""
+        if not column or self._cleaned_columns.get(table_name) == column:
+            return
+        self.temp_engine.clean_amount_column(table_name, column)
+        self._cleaned_columns[table_name] = column
+        self._invalidate_sums(table_name)
+    
+    def _invalidate_sums(self, table_name: str):
+        """Drop cached column sums for a temp table whose data changed."""
+        self._sum_cache = {k: v for k, v in self._sum_cache.items() if k[0] != table_name}
+    
+    def _is_ingested(self, path: str, table_name: str) -> bool:
+        """Check whether the temp engine holds an up-to-date copy of a file."""
+        try:
+            key = self._file_key(path)
+        except OSError:
+            return False
+        return self._ingest_cache.get(key) == table_name
+    
+    def _take_temp_engine(self, amount_a: str, amount_b: str) -> bool:
+        """
+        Promote the preview tables to source tables for a reconciliation run.
+        
+        Only possible when both files are still loaded unchanged and any
+        auto-cleaning applied for the totals matches the selected amount columns.
+        
+        Returns:
+            True if self.engine now holds source_a/source_b, False otherwise
+        """
+        with self._temp_lock:
+            return self._take_temp_engine_locked(amount_a, amount_b)
+    
+    def _take_temp_engine_locked(self, amount_a: str, amount_b: str) -> bool:
+        """Promote the preview tables; caller holds _temp_lock."""
+        if not self.temp_engine:
+            return False
+        if not (self._is_ingested(self.source_a_var.get(), "temp_a")
+                and self._is_ingested(self.source_b_var.get(), "temp_b")):
+            return False
+        if self._cleaned_columns.get("temp_a", amount_a) != amount_a:
+            return False
+        if self._cleaned_columns.get("temp_b", amount_b) != amount_b:
+            return False
+        
+        if self.engine:
+            self.engine.close()
+        self.engine = self.temp_engine
+        self.temp_engine = None
+        self._ingest_cache.clear()
+        self._cleaned_columns.clear()
+        self._sum_cache.clear()
+        self.engine.rename_tables({"temp_a": "source_a", "temp_b": "source_b"})
+        return True
+    
+    def _release_temp_engine(self):
+        """Close the preview engine (if not handed to the run) and reclaim its memory."""
+        with self._temp_lock:
+            if self.temp_engine is not None and self.temp_engine is not self.engine:
+                self.temp_engine.close()
+            self.temp_engine = None
+            self._ingest_cache.clear()
+            self._cleaned_columns.clear()
+            self._sum_cache.clear()
+        gc.collect()
+    
+    def _update_preview(self, rows_a: list, rows_b: list):
+        """Update file preview tables with the sampled rows."""
+        try:
+            if self.columns_a:
+                self._populate_tree(self.preview_a_tree, self.columns_a, rows_a)
             if self.columns_b:
-                self.preview_b_tree.delete(*self.preview_b_tree.get_children())
-                self.preview_b_tree["columns"] = self.columns_b
-                for col in self.columns_b:
-                    self.preview_b_tree.heading(col, text=col)
-                    self.preview_b_tree.column(col, width=100, minwidth=50)
-                
-                # Select columns explicitly in order to match header order
-                cols_b_str = ", ".join([f'"{c}"' for c in self.columns_b])
-                rows_b = self.temp_engine.conn.execute(f"SELECT {cols_b_str} FROM temp_b LIMIT 3").fetchall()
-                for row in rows_b:
-                    self.preview_b_tree.insert("", tk.END, values=row)
+                self._populate_tree(self.preview_b_tree, self.columns_b, rows_b)
         except Exception as e:
             print(f"Preview error: {e}")
     
+    def _populate_tree(self, tree: ttk.Treeview, columns: list, rows: list):
+        """
+        Replace a treeview's columns and rows in one batch.
+        
+        Headings are only reconfigured when the columns differ from the last
+        call for this tree, and columns are hidden while rows are inserted so
+        Tk lays the widget out once instead of after every insert.
+        
+        Args:
+            tree: Treeview to fill
+            columns: Column names
+            rows: Row tuples in column order
+        """
+        columns = tuple(columns)
+        row_values = self._row_values.setdefault(str(tree), {})
+        row_values.clear()
+        
+        if self._tree_columns.get(str(tree)) != columns:
+            tree.configure(columns=columns, displaycolumns="#all")
+            for col in columns:
+                tree.heading(col, text=col)
+                tree.column(col, width=100, minwidth=50)
+            self._tree_columns[str(tree)] = columns
+        
+        rows = [tuple(row) for row in rows]
+        tree.configure(displaycolumns=())
+        row_values.update(zip(replace_rows(tree, rows), rows))
+        tree.configure(displaycolumns="#all")
+    
     def _update_totals(self, event=None):
         """Update the amount column totals display."""
         if not self.temp_engine:
+            # Preview tables are gone (released or handed to the run), so a
+            # total for the newly selected column cannot be shown
+            self.total_a_var.set("--")
+            self.total_b_var.set("--")
             return
         
+        # A background load holds the engine and will refresh the totals itself
+        if not self._temp_lock.acquire(blocking=False):
+            return
         try:
             amount_a = self.amount_col_a_var.get()
             amount_b = self.amount_col_b_var.get()
+            total_a, total_b = self._column_sums([("temp_a", amount_a), ("temp_b", amount_b)])
+            self._set_total(self.total_a_var, amount_a, total_a)
+            self._set_total(self.total_b_var, amount_b, total_b)
+        finally:
+            self._temp_lock.release()
+    
+    def _column_sums(self, specs: List[Tuple[str, str]]) -> list:
+        """
+        Sum temp table columns for the totals display, in one query for any not cached.
+        
+        Args:
+            specs: List of (temp table, column) pairs; empty columns are skipped
             
-            # Get totals (auto-clean first if enabled and column changed)
-            if amount_a:
-                if self.auto_clean_var.get() and event:
-                    # Re-load and clean if column changed
-                    pass  # Cleaning already done on initial load
-                total_a = self.temp_engine.get_column_sum("temp_a", amount_a)
-                if total_a is not None:
-                    self.total_a_var.set(f"{total_a:,.2f}")
-                else:
-                    self.total_a_var.set("N/A")
-            else:
-                self.total_a_var.set("--")
-            
-            if amount_b:
-                total_b = self.temp_engine.get_column_sum("temp_b", amount_b)
-                if total_b is not None:
-                    self.total_b_var.set(f"{total_b:,.2f}")
-                else:
-                    self.total_b_var.set("N/A")
-            else:
-                self.total_b_var.set("--")
-        except Exception as e:
-            self.total_a_var.set("Error")
-            self.total_b_var.set("Error")
+        Returns:
+            Sums in spec order: None if a column is empty or not numeric,
+            or the Exception if the query failed
+        """
+        missing = [spec for spec in specs if spec[1] and spec not in self._sum_cache]
+        if missing:
+            try:
+                for spec, total in zip(missing, self.temp_engine.get_column_sums(missing)):
+                    self._sum_cache[spec] = total
+            except Exception as e:
+                return [e if spec in missing else self._sum_cache.get(spec) for spec in specs]
+        return [self._sum_cache.get(spec) for spec in specs]
+    
+    @staticmethod
+    def _set_total(var: tk.StringVar, column: str, total):
+        """Format a total computed by _column_sums into its display variable."""
+        if not column:
+            var.set("--")
+        elif isinstance(total, Exception):
+            var.set("Error")
+        elif total is None:
+            var.set("N/A")
+        else:
+            var.set(f"{total:,.2f}")
     
     def _run_reconciliation(self):
         """Run the reconciliation process."""
@@ -453,34 +782,34 @@ class ReconApp:
         # Run in background thread
         def process():
             try:
-                # Initialize engine
-                self.engine = ReconEngine()
-                
-                # Load files
-                self.status_var.set("Loading Source A...")
-                self.engine.load_csv(self.source_a_var.get(), "source_a")
-                
-                self.status_var.set("Loading Source B...")
-                self.engine.load_csv(self.source_b_var.get(), "source_b")
+                # Reuse the tables already ingested for the preview when possible
+                if not self._take_temp_engine(self.amount_col_a_var.get(), self.amount_col_b_var.get()):
+                    if self.engine:
+                        self.engine.close()
+                    self.engine = ReconEngine(
+                        on_disk=self._needs_on_disk(self.source_a_var.get(), self.source_b_var.get())
+                    )
+                    
+                    # Load both files concurrently
+                    self.status_var.set("Loading sources...")
+                    self.engine.load_csvs({
+                        "source_a": self.source_a_var.get(),
+                        "source_b": self.source_b_var.get()
+                    })
                 
                 # Clean amount columns to ensure they are numeric (fixes VARCHAR - DOUBLE type mismatch)
+                # and normalize date formats (MM/DD/YYYY -> YYYY-MM-DD), one table rewrite per source
                 if self.auto_clean_var.get():
-                    self.status_var.set("Cleaning amount columns...")
-                    amount_a = self.amount_col_a_var.get()
-                    amount_b = self.amount_col_b_var.get()
-                    if amount_a:
-                        self.engine.clean_amount_column("source_a", amount_a)
-                    if amount_b:
-                        self.engine.clean_amount_column("source_b", amount_b)
-                    
-                    # Clean date columns to normalize formats (MM/DD/YYYY -> YYYY-MM-DD)
-                    self.status_var.set("Normalizing date formats...")
-                    date_a = self.date_col_a_var.get()
-                    date_b = self.date_col_b_var.get()
-                    if date_a:
-                        self.engine.clean_date_column("source_a", date_a)
-                    if date_b:
-                        self.engine.clean_date_column("source_b", date_b)
+                    self.status_var.set("Cleaning amount and date columns...")
+                    for table_name, amount_col, date_col in (
+                        ("source_a", self.amount_col_a_var.get(), self.date_col_a_var.get()),
+                        ("source_b", self.amount_col_b_var.get(), self.date_col_b_var.get())
+                    ):
+                        self.engine.clean_columns(
+                            table_name,
+                            amount_columns=[amount_col] if amount_col else [],
+                            date_columns=[date_col] if date_col else []
+                        )
                 
                 # Run reconciliation
                 self.status_var.set("Running reconciliation...")
@@ -504,6 +833,9 @@ class ReconApp:
                 )
                 self.result = self.engine.reconcile(config)
                 
+                # The preview copies are no longer needed once results exist
+                self._release_temp_engine()
+                
                 # Update UI in main thread
                 self.root.after(0, self._update_results)
                 
@@ -542,24 +874,14 @@ class ReconApp:
         for table_name in tables:
             tree = self.tab_trees[table_name]
             
-            # Clear existing
-            tree.delete(*tree.get_children())
-            
-            # Get columns and data
+            # Configure columns, then let the adapter page rows in as they are viewed
             try:
                 columns = self.engine.get_result_columns(table_name)
-                data = self.engine.get_results(table_name, limit=1000)
-                
-                # Configure columns
-                tree["columns"] = columns
-                for col in columns:
-                    tree.heading(col, text=col)
-                    tree.column(col, width=100, minwidth=50)
-                
-                # Insert data
-                for row in data:
-                    tree.insert("", tk.END, values=row)
-                    
+                self._populate_tree(tree, columns, [])
+                self.tab_adapters[table_name].reset(
+                    self.engine.get_row_count(table_name),
+                    lambda offset, limit, t=table_name: self.engine.get_results(t, limit=limit, offset=offset)
+                )
             except Exception as e:
                 print(f"Error loading {table_name}: {e}")
         
@@ -1,10 +1,246 @@
 """Base Tool class with common UI patterns for all data processing tools."""
 
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import threading
-from typing import Optional, Callable, List, Any
-from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Any, Union
+
+from recon_engine import PatternSet, ReconEngine, compile_patterns
+
+
+# Tcl helpers for filling a treeview without one interpreter round trip per row.
+# datatoolkit_replace_rows overwrites the values of existing items in place, so
+# repeated refreshes reuse the same iids instead of deleting and recreating them.
+_TREE_PROCS = """
+proc ::datatoolkit_bulk_insert {w rows} {
+    set ids {}
+    foreach row $rows {
+        lappend ids [$w insert {} end -values $row]
+    }
+    return $ids
+}
+proc ::datatoolkit_replace_rows {w rows} {
+    set ids [$w children {}]
+    set n [llength $rows]
+    set i 0
+    foreach id $ids {
+        if {$i >= $n} break
+        $w item $id -values [lindex $rows $i]
+        incr i
+    }
+    if {[llength $ids] > $n} {
+        $w delete [lrange $ids $n end]
+    }
+    set ids [lrange $ids 0 [expr {$i - 1}]]
+    for {} {$i < $n} {incr i} {
+        lappend ids [$w insert {} end -values [lindex $rows $i]]
+    }
+    return $ids
+}
+"""
+
+
+def _tree_call(tree: ttk.Treeview, proc: str, rows: List[tuple]) -> tuple:
+    """Run one of the _TREE_PROCS helpers, registering them on first use."""
+    root = tree._root()
+    if not getattr(root, "_tree_procs_ready", False):
+        tree.tk.eval(_TREE_PROCS)
+        root._tree_procs_ready = True
+    return tree.tk.splitlist(
+        tree.tk.call(proc, tree._w, tuple(tuple(row) for row in rows))
+    )
+
+
+def bulk_insert(tree: ttk.Treeview, rows: List[tuple]) -> tuple:
+    """
+    Append rows to a treeview with a single Python-to-Tcl call.
+    
+    Equivalent to calling tree.insert("", "end", values=row) for each row, but
+    the loop runs inside Tcl instead of crossing the interpreter boundary per row.
+    
+    Args:
+        tree: Treeview to append to
+        rows: Row tuples in column order
+        
+    Returns:
+        Item ids of the inserted rows, in order
+    """
+    if not rows:
+        return ()
+    return _tree_call(tree, "::datatoolkit_bulk_insert", rows)
+
+
+def replace_rows(tree: ttk.Treeview, rows: List[tuple]) -> tuple:
+    """
+    Replace the top-level rows of a treeview with a single Python-to-Tcl call.
+    
+    Existing items are reused by overwriting their values, surplus items are
+    deleted in one command and any extra rows are appended. This avoids the
+    delete-everything-then-reinsert cycle on every refresh.
+    
+    Args:
+        tree: Treeview to fill
+        rows: Row tuples in column order
+        
+    Returns:
+        Item ids holding the rows, in order
+    """
+    return _tree_call(tree, "::datatoolkit_replace_rows", rows)
+
+
+class VirtualTreeAdapter:
+    """
+    Show a large table in a Treeview by rendering only the visible rows.
+    
+    The tree holds one screenful of items; scrolling re-renders it from a
+    cached page of rows that is refetched on demand when the view moves
+    outside it. While attached, the vertical scrollbar is driven by the
+    adapter and reflects the full row count.
+    """
+    
+    HEADER_HEIGHT = 25  # Pixels taken by the heading row
+    PAGE_SIZE = 100     # Rows fetched per query (at least two screenfuls)
+    
+    _EVENTS = ("<Configure>", "<MouseWheel>", "<Button-4>", "<Button-5>")
+    
+    def __init__(
+        self,
+        tree: ttk.Treeview,
+        scrollbar: ttk.Scrollbar,
+        row_values: Optional[Dict[str, tuple]] = None
+    ):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        # iid -> row for the rendered items, filled in place
+        self.row_values = row_values if row_values is not None else {}
+        self.fetch: Callable[[int, int], List[tuple]] = lambda offset, limit: []
+        self.total = 0
+        self.first = 0
+        self._cache_start = 0
+        self._cache: List[tuple] = []
+        
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.configure(yscrollcommand="")
+        tree.bind("<Configure>", lambda e: self.render())
+        tree.bind("<MouseWheel>", self._on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+    
+    def reset(self, total: int, fetch: Callable[[int, int], List[tuple]]):
+        """
+        Point the adapter at a new row source and show its first rows.
+        
+        Args:
+            total: Total number of rows available
+            fetch: Callable returning rows for (offset, limit)
+        """
+        self.total = total
+        self.fetch = fetch
+        self.first = 0
+        self._cache_start = 0
+        self._cache = []
+        self.render()
+    
+    def detach(self):
+        """Hand vertical scrolling back to the tree itself."""
+        for sequence in self._EVENTS:
+            self.tree.unbind(sequence)
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+    
+    def visible_rows(self) -> int:
+        """Number of rows that fit in the tree's current height."""
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or 20
+        height = self.tree.winfo_height() - self.HEADER_HEIGHT
+        return max(1, height // int(row_height))
+    
+    def render(self):
+        """Redraw the rows for the current scroll position."""
+        visible = self.visible_rows()
+        self.first = max(0, min(self.first, self.total - visible))
+        rows = self._rows(self.first, visible)
+        
+        rows = [tuple(row) for row in rows]
+        self.row_values.clear()
+        self.row_values.update(zip(replace_rows(self.tree, rows), rows))
+        
+        if self.total:
+            self.scrollbar.set(self.first / self.total, min(1.0, (self.first + visible) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _rows(self, first: int, count: int) -> List[tuple]:
+        """Return rows [first, first + count), fetching a new page if needed."""
+        cache_end = self._cache_start + len(self._cache)
+        if first < self._cache_start or min(first + count, self.total) > cache_end:
+            window = max(self.PAGE_SIZE, count * 2)
+            self._cache_start = max(0, first - window // 2)
+            self._cache = self.fetch(self._cache_start, window)
+        offset = first - self._cache_start
+        return self._cache[offset:offset + count]
+    
+    def _scroll_by(self, rows: int):
+        """Move the view by a number of rows."""
+        self.first += rows
+        self.render()
+        return "break"
+    
+    def _on_mousewheel(self, event):
+        """Scroll three rows per wheel notch."""
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+    
+    def _on_scrollbar(self, *args):
+        """Handle scrollbar drags ("moveto") and arrow/trough clicks ("scroll")."""
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = self.visible_rows() if args[2] == "pages" else 1
+            self.first += int(args[1]) * step
+        self.render()
+
+
+class ScrolledFrame(ttk.Frame):
+    """
+    Vertically scrollable frame: a canvas, its scrollbar and an inner frame.
+    
+    Widgets go into .inner. The mouse wheel scrolls the canvas while the
+    pointer is over this frame's descendants, except over Treeviews, which
+    scroll themselves; the global wheel binding is removed when the frame
+    is destroyed.
+    """
+    
+    def __init__(self, parent: tk.Widget, padding: str = "0"):
+        super().__init__(parent)
+        
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.inner = ttk.Frame(self.canvas, padding=padding)
+        
+        self.inner.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+        
+        self.canvas.create_window((0, 0), window=self.inner, anchor="nw")
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+    
+    def _on_mousewheel(self, event):
+        """Scroll for wheel events over this frame's content."""
+        if not str(event.widget).startswith(str(self) + ".") or isinstance(event.widget, ttk.Treeview):
+            return
+        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+    
+    def _on_destroy(self, event):
+        """Drop the global wheel binding with the canvas it scrolls."""
+        if event.widget is self:
+            self.canvas.unbind_all("<MouseWheel>")
 
 
 class BaseTool(ttk.Frame):
@@ -21,6 +257,20 @@ class BaseTool(ttk.Frame):
     - Navigation (back to home)
     """
     
+    # DuckDB type name prefixes of numeric columns
+    NUMERIC_TYPES = (
+        "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+        "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+        "FLOAT", "DOUBLE", "DECIMAL",
+    )
+    
+    # Worker pool shared by all tools for background jobs (created on first use)
+    _executor: Optional[ThreadPoolExecutor] = None
+    
+    # Right-click menu shared by all tools, and the tool it was last opened for
+    _context_menu: Optional[tk.Menu] = None
+    _active_context_tool: Optional["BaseTool"] = None
+    
     def __init__(self, parent: tk.Widget, controller=None, on_back: Optional[Callable] = None):
         """
         Initialize the base tool.
@@ -38,22 +288,47 @@ class BaseTool(ttk.Frame):
         # Status variable
         self.status_var = tk.StringVar(value="Ready")
         
-        # Context menu for copying
-        self._context_menu: Optional[tk.Menu] = None
+        # Cell targeted by the shared context menu
         self._context_tree: Optional[ttk.Treeview] = None
-        self._context_column: str = ""
+        self._context_col_index: int = -1
         
         # Progress indicator
         self._progress_label: Optional[ttk.Label] = None
         self._progress_bar: Optional[ttk.Progressbar] = None
         
+        # Inline error banner (created on first background error)
+        self._status_frame: Optional[ttk.Frame] = None
+        self._error_banner: Optional[ttk.Label] = None
+        self._error_banner_timer: Optional[str] = None
+        
+        # Vertical scrollbars of preview tables, and virtualized previews, by tree
+        self._tree_scrollbars: Dict[str, ttk.Scrollbar] = {}
+        self._preview_adapters: Dict[str, VirtualTreeAdapter] = {}
+        
+        # Columns last configured on each preview tree, and the latest request per tree
+        self._preview_columns: Dict[str, tuple] = {}
+        self._preview_requests: Dict[str, int] = {}
+        
+        # Column lists and detection results, valid for one engine schema version
+        self._columns_cache: Dict[str, List[str]] = {}
+        self._detect_cache: Dict[tuple, Optional[str]] = {}
+        self._detect_cache_owner: Optional[tuple] = None
+        
         # Threading
         self._update_timer: Optional[str] = None
+        self._pending_updates: Dict[Any, Callable] = {}
+        
+        # Results posted by worker threads, handed to the UI thread in batches
+        self._ui_queue: "queue.Queue[tuple]" = queue.Queue()
+        self.bind("<<ThreadComplete>>", self._drain_completions)
         
         # Auto-detection patterns
         self.date_patterns = ["date", "dt", "trans_date", "posting", "created", "updated"]
         self.amount_patterns = ["amount", "amt", "value", "total", "sum", "price", "cost"]
         self.desc_patterns = ["description", "desc", "narration", "memo", "reference", "note"]
+        self._date_re = compile_patterns(self.date_patterns)
+        self._amount_re = compile_patterns(self.amount_patterns)
+        self._desc_re = compile_patterns(self.desc_patterns)
     
     @property
     def engine(self):
@@ -164,6 +439,7 @@ class BaseTool(ttk.Frame):
             vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
             hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
             tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+            self._tree_scrollbars[str(tree)] = vsb
             
             tree.grid(row=0, column=0, sticky="nsew")
             vsb.grid(row=0, column=1, sticky="ns")
@@ -191,6 +467,7 @@ class BaseTool(ttk.Frame):
         """
         status_frame = ttk.Frame(parent)
         status_frame.pack(fill=tk.X, pady=(5, 0))
+        self._status_frame = status_frame
         
         status_label = ttk.Label(status_frame, textvariable=self.status_var)
         status_label.pack(side=tk.LEFT)
@@ -218,6 +495,11 @@ class BaseTool(ttk.Frame):
         """
         Update preview table with data from DuckDB table.
         
+        When more rows are requested than the tree shows and the tree was made
+        by create_preview_table, only the visible rows are rendered and the
+        rest are fetched as the user scrolls. The query runs on the shared
+        worker pool and the tree is filled once it returns.
+        
         Args:
             tree: Treeview widget to update
             table_name: Name of the DuckDB table
@@ -227,24 +509,104 @@ class BaseTool(ttk.Frame):
         if not self.engine or not columns:
             return
         
+        # Rows are fetched on a worker thread; only the newest request per tree is applied
+        engine = self.engine
+        columns = list(columns)
+        request = self._preview_requests[str(tree)] = self._preview_requests.get(str(tree), 0) + 1
+        virtual = str(tree) in self._tree_scrollbars and limit > int(tree.cget("height"))
+        
+        def worker():
+            try:
+                result = self._preview_fetch(engine, table_name, columns, limit, virtual)
+            except Exception as e:
+                print(f"Preview error for {table_name}: {e}")
+                return
+            self._post_to_ui(self._preview_apply, tree, request, table_name, columns, virtual, result)
+        
+        self._get_executor().submit(worker)
+    
+    def show_preview_rows(self, tree: ttk.Treeview, columns: List[str], rows: List[tuple]):
+        """
+        Show rows that are already in memory in a preview table.
+        
+        Any preview query still running for the tree is discarded.
+        
+        Args:
+            tree: Treeview widget to update
+            columns: List of column names
+            rows: Row tuples in column order
+        """
+        request = self._preview_requests[str(tree)] = self._preview_requests.get(str(tree), 0) + 1
+        self._preview_apply(tree, request, "", list(columns), False, rows)
+    
+    @staticmethod
+    def _preview_fetch(engine, table_name: str, columns: List[str], limit: int, virtual: bool):
+        """
+        Query preview data on a private cursor (safe to call off the UI thread).
+        
+        Returns:
+            Row count to page through when virtual, else the preview rows
+        """
+        cursor = engine.conn.cursor()
+        try:
+            if virtual:
+                return min(limit, engine.get_row_count(table_name, conn=cursor))
+            # Projection and LIMIT are pushed into DuckDB
+            return engine.preview_rows(table_name, columns, limit, conn=cursor)
+        finally:
+            cursor.close()
+    
+    def _preview_apply(
+        self,
+        tree: ttk.Treeview,
+        request: int,
+        table_name: str,
+        columns: List[str],
+        virtual: bool,
+        result
+    ):
+        """Show fetched preview data in the tree (UI thread)."""
+        if self._preview_requests.get(str(tree)) != request or not tree.winfo_exists():
+            return
+        
         try:
-            # Clear existing data
-            tree.delete(*tree.get_children())
+            # Configure columns (skipped when the schema is unchanged)
+            if self._preview_columns.get(str(tree)) != tuple(columns):
+                tree["columns"] = columns
+                for col in columns:
+                    tree.heading(col, text=col)
+                    tree.column(col, width=100, minwidth=50)
+                self._preview_columns[str(tree)] = tuple(columns)
+            
+            adapter = self._preview_adapters.get(str(tree))
             
-            # Configure columns
-            tree["columns"] = columns
-            for col in columns:
-                tree.heading(col, text=col)
-                tree.column(col, width=100, minwidth=50)
+            if virtual:
+                # Virtualized: fetch windows of rows on demand
+                total = result
+                if adapter is None:
+                    adapter = self._preview_adapters[str(tree)] = VirtualTreeAdapter(
+                        tree, self._tree_scrollbars[str(tree)]
+                    )
+                adapter.reset(
+                    total,
+                    lambda offset, count: self.engine.preview_rows(
+                        table_name, columns, max(0, min(count, total - offset)), offset
+                    )
+                )
+                return
             
-            # Fetch and insert data
-            cols_str = ", ".join([f'"{c}"' for c in columns])
-            rows = self.engine.conn.execute(
-                f"SELECT {cols_str} FROM {table_name} LIMIT {limit}"
-            ).fetchall()
+            if adapter is not None:
+                adapter.detach()
+                del self._preview_adapters[str(tree)]
             
-            for row in rows:
-                tree.insert("", tk.END, values=row)
+            # Existing items are overwritten in place rather than deleted; columns
+            # are hidden meanwhile so Tk lays the tree out once for the batch
+            saved = tree.cget("displaycolumns")
+            tree.configure(displaycolumns=())
+            try:
+                replace_rows(tree, result)
+            finally:
+                tree.configure(displaycolumns=saved)
                 
         except Exception as e:
             print(f"Preview error for {table_name}: {e}")
@@ -262,14 +624,26 @@ class BaseTool(ttk.Frame):
             tree.selection_set(item)
             tree.focus(item)
             self._context_tree = tree
-            self._context_column = column
-            
-            # Create menu if needed
-            if self._context_menu is None:
-                self._context_menu = tk.Menu(self, tearoff=0)
-                self._context_menu.add_command(label="Copy", command=self._copy_cell_value)
+            # Tk reports the column as "#1", "#2", etc.
+            self._context_col_index = int(column[1:]) - 1
+            BaseTool._active_context_tool = self
             
-            self._context_menu.tk_popup(event.x_root, event.y_root)
+            self._get_context_menu(self.winfo_toplevel()).tk_popup(event.x_root, event.y_root)
+    
+    @classmethod
+    def _get_context_menu(cls, root: tk.Misc) -> tk.Menu:
+        """Return the context menu shared by all tools, creating it on first use."""
+        if BaseTool._context_menu is None:
+            BaseTool._context_menu = tk.Menu(root, tearoff=0)
+            BaseTool._context_menu.add_command(label="Copy", command=cls._copy_active_cell)
+        return BaseTool._context_menu
+    
+    @staticmethod
+    def _copy_active_cell():
+        """Copy handler of the shared menu; forwards to the tool that opened it."""
+        tool = BaseTool._active_context_tool
+        if tool is not None:
+            tool._copy_cell_value()
     
     def _copy_cell_value(self):
         """Copy the selected cell value to clipboard."""
@@ -280,8 +654,7 @@ class BaseTool(ttk.Frame):
         if not selection:
             return
         
-        # Get column index (format is "#1", "#2", etc.)
-        col_index = int(self._context_column.replace('#', '')) - 1
+        col_index = self._context_col_index
         
         # Get the row values
         item = selection[0]
@@ -335,33 +708,85 @@ class BaseTool(ttk.Frame):
     def detect_column(
         self, 
         table_name: str, 
-        patterns: List[str]
+        patterns: Union[List[str], PatternSet]
     ) -> Optional[str]:
         """
         Find first column matching any pattern (case-insensitive).
         
         Args:
             table_name: Name of the DuckDB table
-            patterns: List of substring patterns to match
+            patterns: List of substring patterns, or a compile_patterns() matcher
             
         Returns:
             Column name if found, None otherwise
         """
-        if self.engine:
-            return self.engine.detect_column(table_name, patterns)
-        return None
+        engine = self.engine
+        if not engine:
+            return None
+        
+        # Results stay valid until the engine reports a schema change
+        if self._detect_cache_owner != (engine, engine.schema_version):
+            self._columns_cache.clear()
+            self._detect_cache.clear()
+            self._detect_cache_owner = (engine, engine.schema_version)
+        
+        key = (table_name, patterns if isinstance(patterns, PatternSet) else tuple(patterns))
+        if key not in self._detect_cache:
+            columns = self._columns_cache.get(table_name)
+            if columns is None:
+                columns = self._columns_cache[table_name] = engine.get_columns(table_name)
+            self._detect_cache[key] = self.detect_column_local(columns, patterns)
+        return self._detect_cache[key]
+    
+    @staticmethod
+    def detect_column_local(
+        columns: List[str],
+        patterns: Union[List[str], PatternSet]
+    ) -> Optional[str]:
+        """
+        Find the first of the given column names matching any pattern.
+        
+        Works on an already known column list, so no query is issued.
+        
+        Args:
+            columns: Column names in table order
+            patterns: List of substring patterns, or a compile_patterns() matcher
+            
+        Returns:
+            Column name if found, None otherwise
+        """
+        return ReconEngine.match_column(columns, patterns)
+    
+    def detect_all_columns(self, table_name: str) -> Dict[str, Optional[str]]:
+        """
+        Detect the date, amount and description columns of a table.
+        
+        The column list is read once and shared by all three matchers.
+        
+        Args:
+            table_name: Name of the DuckDB table
+            
+        Returns:
+            Dictionary with 'date', 'amount' and 'description' column names
+            (None where no column matched)
+        """
+        return {
+            "date": self.detect_column(table_name, self._date_re),
+            "amount": self.detect_column(table_name, self._amount_re),
+            "description": self.detect_column(table_name, self._desc_re),
+        }
     
     def detect_date_column(self, table_name: str) -> Optional[str]:
         """Detect date column in table."""
-        return self.detect_column(table_name, self.date_patterns)
+        return self.detect_column(table_name, self._date_re)
     
     def detect_amount_column(self, table_name: str) -> Optional[str]:
         """Detect amount column in table."""
-        return self.detect_column(table_name, self.amount_patterns)
+        return self.detect_column(table_name, self._amount_re)
     
     def detect_description_column(self, table_name: str) -> Optional[str]:
         """Detect description column in table."""
-        return self.detect_column(table_name, self.desc_patterns)
+        return self.detect_column(table_name, self._desc_re)
     
     # =========================================================================
     # Threading Helpers
@@ -374,6 +799,7 @@ class BaseTool(ttk.Frame):
         on_error: Optional[Callable[[Exception], None]] = None,
         progress_message: str = "Processing...",
         *args, 
+        show_modal: bool = False,
         **kwargs
     ):
         """
@@ -384,19 +810,59 @@ class BaseTool(ttk.Frame):
             on_complete: Callback with result when complete
             on_error: Callback with exception on error
             progress_message: Status message during processing
-            *args, **kwargs: Arguments passed to target_func
+            *args: Arguments passed to target_func
+            show_modal: Report unhandled errors in a modal dialog instead of
+                the non-blocking status bar banner (keyword only)
+            **kwargs: Keyword arguments passed to target_func
         """
         self._show_progress(progress_message)
         
         def worker():
             try:
                 result = target_func(*args, **kwargs)
-                self.after(0, lambda: self._on_thread_complete(result, on_complete))
+                self._post_to_ui(self._on_thread_complete, result, on_complete)
             except Exception as e:
-                self.after(0, lambda: self._on_thread_error(e, on_error))
+                self._post_to_ui(self._on_thread_error, e, on_error, show_modal)
         
-        thread = threading.Thread(target=worker, daemon=True)
-        thread.start()
+        self._get_executor().submit(worker)
+    
+    def _post_to_ui(self, func: Callable, *args):
+        """
+        Queue a call for the UI thread (safe to call from worker threads).
+        
+        Calls are run by _drain_completions, which empties the whole queue
+        per <<ThreadComplete>> event, so a burst of results costs one wakeup.
+        """
+        self._ui_queue.put((func, args))
+        try:
+            self.event_generate("<<ThreadComplete>>", when="tail")
+        except tk.TclError:
+            pass  # Tool was destroyed; nothing left to update
+    
+    def _drain_completions(self, event=None):
+        """Run every call queued by _post_to_ui, reporting failures without stopping."""
+        while True:
+            try:
+                func, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                func(*args)
+            except Exception as e:
+                # One failing callback must not strand the ones queued after it
+                print(f"UI callback error in {getattr(func, '__name__', func)}: {e}")
+                if self._status_frame is not None:
+                    try:
+                        self._show_error_banner(str(e))
+                    except tk.TclError:
+                        pass  # Tool was destroyed
+    
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        """Return the shared worker pool, creating it on first use."""
+        if BaseTool._executor is None:
+            BaseTool._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tool-io")
+        return BaseTool._executor
     
     def _on_thread_complete(self, result: Any, on_complete: Optional[Callable]):
         """Handle thread completion, update UI."""
@@ -404,13 +870,39 @@ class BaseTool(ttk.Frame):
         if on_complete:
             on_complete(result)
     
-    def _on_thread_error(self, error: Exception, on_error: Optional[Callable]):
+    def _on_thread_error(self, error: Exception, on_error: Optional[Callable], show_modal: bool = False):
         """Handle thread error."""
         self._hide_progress()
         if on_error:
             on_error(error)
-        else:
+        elif show_modal or self._status_frame is None:
             messagebox.showerror("Error", str(error))
+        else:
+            self._show_error_banner(str(error))
+    
+    def _show_error_banner(self, message: str, duration_ms: int = 8000):
+        """
+        Show an error in the status bar without blocking the event loop.
+        
+        Args:
+            message: Error text
+            duration_ms: How long the banner stays visible
+        """
+        self.status_var.set("Error")
+        if self._error_banner is None:
+            self._error_banner = ttk.Label(self._status_frame, foreground="red")
+        self._error_banner.configure(text=f"⚠ {message}")
+        self._error_banner.pack(side=tk.LEFT, padx=10)
+        
+        if self._error_banner_timer:
+            self.after_cancel(self._error_banner_timer)
+        self._error_banner_timer = self.after(duration_ms, self._hide_error_banner)
+    
+    def _hide_error_banner(self):
+        """Hide the status bar error banner."""
+        self._error_banner_timer = None
+        if self._error_banner is not None:
+            self._error_banner.pack_forget()
     
     def _show_progress(self, message: str):
         """Show progress indicator and update status."""
@@ -425,17 +917,33 @@ class BaseTool(ttk.Frame):
             self._progress_bar.stop()
             self._progress_bar.pack_forget()
     
-    def schedule_update(self, callback: Callable, delay_ms: int = 300):
+    def schedule_update(self, callback: Callable, delay_ms: int = 300, key: Any = None):
         """
-        Schedule a debounced update (cancels previous pending update).
+        Schedule a debounced update.
+        
+        Pending updates are coalesced by key: scheduling the same key again
+        replaces its pending callback, while different keys are kept. All
+        pending callbacks run together in one after() callback once delay_ms
+        passes without new requests.
         
         Args:
             callback: Function to call
             delay_ms: Delay in milliseconds
+            key: Coalescing key (defaults to the callback itself; bound
+                methods of the same object and function compare equal)
         """
+        self._pending_updates[callback if key is None else key] = callback
         if self._update_timer:
             self.after_cancel(self._update_timer)
-        self._update_timer = self.after(delay_ms, callback)
+        self._update_timer = self.after(delay_ms, self._run_pending_updates)
+    
+    def _run_pending_updates(self):
+        """Run all coalesced updates scheduled via schedule_update."""
+        self._update_timer = None
+        pending = list(self._pending_updates.values())
+        self._pending_updates.clear()
+        for callback in pending:
+            callback()
     
     # =========================================================================
     # Status & Navigation
@@ -458,7 +966,8 @@ class BaseTool(ttk.Frame):
         self, 
         table_name: str, 
         output_dir: Optional[str] = None,
-        filename: Optional[str] = None
+        filename: Optional[str] = None,
+        parquet: bool = False
     ) -> Optional[str]:
         """
         Export a DuckDB table to CSV.
@@ -467,6 +976,7 @@ class BaseTool(ttk.Frame):
             table_name: Name of the table to export
             output_dir: Output directory (prompts if None)
             filename: Custom filename (uses table_name if None)
+            parquet: Write a Parquet file instead of CSV (smaller, faster to reload)
             
         Returns:
             Path to exported file, or None if cancelled
@@ -481,9 +991,9 @@ class BaseTool(ttk.Frame):
                 return None
         
         try:
-            filename = filename or f"{table_name}.csv"
+            filename = filename or f"{table_name}.{'parquet' if parquet else 'csv'}"
             output_path = f"{output_dir}/{filename}"
-            self.engine.export_table(table_name, output_path)
+            self.engine.export_table(table_name, output_path, "parquet" if parquet else "csv")
             self._show_status(f"Exported: {filename}")
             return output_path
         except Exception as e:
@@ -1,10 +1,13 @@
 """Data Aggregation Tool for combining and grouping data."""
 
+import os
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from tkinter import ttk, messagebox, filedialog
 from typing import List, Dict, Optional, Any
 from pathlib import Path
-from base_tool import BaseTool
+from base_tool import BaseTool, VirtualTreeAdapter
 
 
 class DataAggregator(BaseTool):
@@ -27,11 +30,20 @@ class DataAggregator(BaseTool):
         
         # File list state
         self.file_list: List[str] = []
-        self.file_tables: List[str] = []  # Table names for each file
-        self.combined_table = "combined_data"
+        self._file_set: set = set()  # Same paths as file_list, for membership tests
+        self.combined_table = "combined_data"  # View over all files in file_list
         self.aggregated_table = "aggregated_results"
         self.columns: List[str] = []
         
+        # Inputs/settings of the last aggregation and its totals, so a change
+        # of sort order only reorders the grouped table
+        self._agg_cache_key: Optional[tuple] = None
+        self._agg_cache_result: Optional[Dict[str, Any]] = None
+        self._agg_cache_order: Optional[str] = None
+        
+        # Bumped whenever the file set changes, so a stale row count is dropped
+        self._row_count_generation = 0
+        
         # Aggregation settings
         self.primary_group_var = tk.StringVar()
         self.sum_col_var = tk.StringVar()
@@ -43,6 +55,7 @@ class DataAggregator(BaseTool):
         self.status_label: Optional[ttk.Label] = None
         self.combined_preview_tree: Optional[ttk.Treeview] = None
         self.results_tree: Optional[ttk.Treeview] = None
+        self._results_adapter: Optional[VirtualTreeAdapter] = None
         self.additional_checkboxes_frame: Optional[ttk.Frame] = None
         self.grand_total_var = tk.StringVar(value="--")
         self.record_count_var = tk.StringVar(value="--")
@@ -225,6 +238,9 @@ class DataAggregator(BaseTool):
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
         
+        # Results are paged in as the user scrolls
+        self._results_adapter = VirtualTreeAdapter(self.results_tree, vsb)
+        
         # Bind right-click for context menu
         self.results_tree.bind("<Button-3>", 
             lambda e: self._show_context_menu(e, self.results_tree))
@@ -249,11 +265,15 @@ class DataAggregator(BaseTool):
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
         )
         
+        new_paths = []
         for path in paths:
-            if path not in self.file_list:
-                self.file_list.append(path)
-                filename = Path(path).name
-                self.file_listbox.insert(tk.END, filename)
+            if path not in self._file_set:
+                self._file_set.add(path)
+                new_paths.append(path)
+        
+        if new_paths:
+            self.file_list.extend(new_paths)
+            self.file_listbox.insert(tk.END, *(Path(path).name for path in new_paths))
         
         if paths:
             self._validate_and_combine_files()
@@ -264,7 +284,7 @@ class DataAggregator(BaseTool):
         if selection:
             index = selection[0]
             self.file_listbox.delete(index)
-            del self.file_list[index]
+            self._file_set.discard(self.file_list.pop(index))
             
             if self.file_list:
                 self._validate_and_combine_files()
@@ -275,12 +295,17 @@ class DataAggregator(BaseTool):
         """Clear all files from the list."""
         self.file_listbox.delete(0, tk.END)
         self.file_list = []
+        self._file_set.clear()
         self._clear_combined_preview()
     
     def _clear_combined_preview(self):
         """Clear the combined preview and reset state."""
         self.combined_preview_tree.delete(*self.combined_preview_tree.get_children())
         self.combined_preview_tree["columns"] = []
+        self._agg_cache_key = None
+        self._row_count_generation += 1
+        self._preview_columns.pop(str(self.combined_preview_tree), None)
+        self._preview_requests.pop(str(self.combined_preview_tree), None)
         self.columns = []
         self.primary_group_combo['values'] = []
         self.sum_col_combo['values'] = []
@@ -298,22 +323,21 @@ class DataAggregator(BaseTool):
             return
         
         self._show_status("Validating files...")
+        self._agg_cache_key = None
         
         try:
-            # Load each file into a temporary table
-            self.file_tables = []
+            # Compare headers only; the data is not read until it is queried
+            peeks = self._peek_files(self.file_list, n=5)
+            reference_header = None
             reference_cols = None
             
-            for i, path in enumerate(self.file_list):
-                table_name = f"input_file_{i}"
-                cols = self.engine.load_csv(path, table_name)
-                self.file_tables.append(table_name)
-                
+            for path, (cols, _) in zip(self.file_list, peeks):
                 if reference_cols is None:
-                    reference_cols = set(cols)
-                    self.columns = cols
-                else:
-                    current_cols = set(cols)
+                    reference_header = cols
+                    reference_cols = frozenset(cols)
+                elif cols != reference_header:
+                    # Same columns in another order are still compatible
+                    current_cols = frozenset(cols)
                     if current_cols != reference_cols:
                         missing = reference_cols - current_cols
                         extra = current_cols - reference_cols
@@ -323,34 +347,83 @@ class DataAggregator(BaseTool):
                             f"Extra columns: {extra}"
                         )
             
-            # Combine files
-            self.engine.union_tables(self.file_tables, self.combined_table)
+            # Combine files lazily as a view instead of copying them into tables
+            self.columns = self.engine.create_csv_view(self.file_list, self.combined_table)
             
-            # Update UI
-            total_rows = self.engine.get_row_count(self.combined_table)
+            # Update UI; counting the rows scans every file, so it runs in the background
             self.files_status_label.config(
                 text=f"✓ All files compatible ({len(self.columns)} columns)", 
                 foreground="green"
             )
-            self.total_rows_label.config(text=f"Total Rows: {total_rows:,}")
+            self._count_combined_rows()
             
-            # Update preview
-            self.update_preview(
-                self.combined_preview_tree,
-                self.combined_table,
-                self.columns,
-                limit=5
-            )
+            # Update preview, straight from the peeked rows when the first file covers it
+            first_cols, first_rows = peeks[0]
+            if first_cols == self.columns and (len(first_rows) == 5 or len(peeks) == 1):
+                self.show_preview_rows(self.combined_preview_tree, self.columns, first_rows)
+            else:
+                self.update_preview(
+                    self.combined_preview_tree,
+                    self.combined_table,
+                    self.columns,
+                    limit=5
+                )
             
             # Update aggregation dropdowns
             self._update_aggregation_options()
             
-            self._show_status(f"Loaded {len(self.file_list)} files, {total_rows:,} total rows")
+            self._show_status(f"Loaded {len(self.file_list)} files")
             
         except Exception as e:
             self.files_status_label.config(text=f"✗ {str(e)[:50]}", foreground="red")
             messagebox.showerror("Validation Error", str(e))
     
+    def _peek_files(self, paths: List[str], n: int = 5) -> List[tuple]:
+        """Read the header and first n rows of several CSV files concurrently."""
+        engine = self.engine
+        
+        def peek(path: str) -> tuple:
+            cursor = engine.conn.cursor()
+            try:
+                return engine.peek_csv(path, n=n, conn=cursor)
+            finally:
+                cursor.close()
+        
+        if len(paths) == 1:
+            return [engine.peek_csv(paths[0], n=n)]
+        
+        # A pool of its own: waiting here on the shared pool would block the
+        # UI behind (or deadlock with) tasks queued by run_threaded
+        with ThreadPoolExecutor(max_workers=min(len(paths), 4)) as pool:
+            return list(pool.map(peek, paths))
+    
+    def _count_combined_rows(self):
+        """Count the combined view's rows off the UI thread and show the total."""
+        self._row_count_generation += 1
+        generation = self._row_count_generation
+        engine = self.engine
+        self.total_rows_label.config(text="Total Rows: counting...")
+        
+        def count():
+            try:
+                cursor = engine.conn.cursor()
+                try:
+                    total = engine.get_row_count(self.combined_table, conn=cursor)
+                finally:
+                    cursor.close()
+            except Exception:
+                total = None
+            self._post_to_ui(self._on_row_count, generation, total)
+        
+        self._get_executor().submit(count)
+    
+    def _on_row_count(self, generation: int, total: Optional[int]):
+        """Show a row count from _count_combined_rows unless the files changed since."""
+        if generation != self._row_count_generation:
+            return
+        text = f"Total Rows: {total:,}" if total is not None else "Total Rows: --"
+        self.total_rows_label.config(text=text)
+    
     def _update_aggregation_options(self):
         """Update aggregation dropdown options based on loaded columns."""
         # Primary group by - all columns
@@ -359,7 +432,7 @@ class DataAggregator(BaseTool):
             self.primary_group_var.set(self.columns[0])
         
         # Sum column - prefer detected amount columns
-        amount_col = self.detect_amount_column(self.combined_table)
+        amount_col = self._detect_sum_column()
         self.sum_col_combo['values'] = self.columns
         if amount_col:
             self.sum_col_var.set(amount_col)
@@ -381,6 +454,22 @@ class DataAggregator(BaseTool):
             )
             cb.pack(side=tk.LEFT, padx=5)
     
+    def _detect_sum_column(self) -> Optional[str]:
+        """
+        Pick the default sum column from the combined view's schema.
+        
+        Numeric columns with an amount-like name win, then any amount-like
+        name, then the first numeric column. Only column types are read.
+        """
+        schema = self.engine.get_schema_info(self.combined_table)
+        names = [col['name'] for col in schema]
+        numeric = [col['name'] for col in schema if col['type'].startswith(self.NUMERIC_TYPES)]
+        return (
+            self.detect_column_local(numeric, self._amount_re)
+            or self.detect_column_local(names, self._amount_re)
+            or (numeric[0] if numeric else None)
+        )
+    
     # =========================================================================
     # Aggregation
     # =========================================================================
@@ -422,36 +511,56 @@ class DataAggregator(BaseTool):
         elif sort_by == "count":
             order_by = "record_count DESC"
         else:
-            order_by = f'"{primary_group}" ASC'
+            order_by = '"' + primary_group.replace('"', '""') + '" ASC'
         
-        # Run aggregation
-        result = self.engine.aggregate_data(
-            self.combined_table,
-            group_cols,
-            sum_col,
-            self.aggregated_table,
-            order_by
+        # Same files (unchanged on disk) and grouping as last time: just re-sort
+        input_key = tuple(
+            (path, os.path.getmtime(path), os.path.getsize(path)) for path in self.file_list
         )
-        
-        return result
+        cache_key = (input_key, tuple(group_cols), sum_col)
+        if cache_key == self._agg_cache_key:
+            if order_by != self._agg_cache_order:
+                self.engine.sort_table(self.aggregated_table, order_by)
+            totals = self._agg_cache_result
+        else:
+            # Run aggregation
+            totals = self.engine.aggregate_data(
+                self.combined_table,
+                group_cols,
+                sum_col,
+                self.aggregated_table,
+                order_by
+            )
+            self._agg_cache_key = cache_key
+            self._agg_cache_result = totals
+        self._agg_cache_order = order_by
+        
+        # Everything the UI shows is gathered here, off the Tk thread
+        return {
+            **totals,
+            'columns': group_cols + ['record_count', 'total_amount'],
+            'rows': self._format_result_rows(
+                self.engine.get_results(self.aggregated_table, limit=500)
+            ),
+        }
     
     def _on_aggregation_complete(self, result: Dict[str, Any]):
         """Handle aggregation completion."""
-        # Get result columns
-        result_columns = self.engine.get_columns(self.aggregated_table)
+        result_columns = result['columns']
+        rows = result['rows']
         
         # Update results tree
-        self.results_tree.delete(*self.results_tree.get_children())
         self.results_tree["columns"] = result_columns
         
         for col in result_columns:
             self.results_tree.heading(col, text=col)
             self.results_tree.column(col, width=120, minwidth=80)
         
-        # Insert data
-        rows = self.engine.get_results(self.aggregated_table, limit=500)
-        for row in rows:
-            self.results_tree.insert("", tk.END, values=row)
+        # Show the first 500 groups; only the visible window is inserted
+        self._results_adapter.reset(
+            len(rows),
+            lambda offset, count: rows[offset:offset + count]
+        )
         
         # Update grand totals
         grand_total = result.get('grand_total', 0)
@@ -462,9 +571,21 @@ class DataAggregator(BaseTool):
         else:
             self.grand_total_var.set("--")
         self.record_count_var.set(f"{total_records:,}")
+        self.total_rows_label.config(text=f"Total Rows: {total_records:,}")
         
         self._show_status(f"Aggregated: {result['row_count']} groups, {total_records:,} total records")
     
+    @staticmethod
+    def _format_result_rows(rows: List[tuple]) -> List[tuple]:
+        """Convert result rows to display strings, with total_amount as 1,234.56."""
+        # total_amount is the last column; group keys keep their exact value
+        formatted = []
+        for row in rows:
+            *keys, total = row
+            total = f"{total:,.2f}" if isinstance(total, (float, Decimal)) else str(total)
+            formatted.append(tuple(str(v) for v in keys) + (total,))
+        return formatted
+    
     def _export_results(self):
         """Export aggregated results to CSV."""
         try:
@@ -484,12 +605,19 @@ class DataAggregator(BaseTool):
         if not output_path:
             return
         
-        try:
-            row_count = self.engine.export_table(self.aggregated_table, output_path)
+        def on_complete(row_count: int):
             messagebox.showinfo(
                 "Export Complete",
                 f"Exported {row_count:,} rows to:\n{output_path}"
             )
             self._show_status(f"Exported: {output_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        
+        # DuckDB's COPY writes the file natively; keep the UI responsive meanwhile
+        self.run_threaded(
+            self.engine.export_table,
+            on_complete,
+            lambda e: messagebox.showerror("Export Error", str(e)),
+            "Exporting results...",
+            self.aggregated_table,
+            output_path
+        )
@@ -1,10 +1,12 @@
 """Data Analysis Tool for filtering and analyzing data with range conditions."""
 
+import threading
 import tkinter as tk
+from datetime import date
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable
 from dataclasses import dataclass
-from base_tool import BaseTool
+from base_tool import BaseTool, ScrolledFrame
 
 
 @dataclass
@@ -88,6 +90,19 @@ class DataAnalyzer(BaseTool):
         # Filter state
         self.filter_manager = FilterManager()
         
+        # Loads of input_table so far, and the signature/result of the filter that
+        # produced filtered_table, so re-applying unchanged filters skips the scan
+        self._load_count = 0
+        self.column_types: Dict[str, str] = {}  # DuckDB type per column, set once loaded
+        
+        # Background load of input_table: serialized by the lock, and actions
+        # requested while it runs are deferred until it finishes
+        self._load_lock = threading.Lock()
+        self._loading = False
+        self._after_load: Optional[Callable] = None
+        self._filter_signature: Optional[tuple] = None
+        self._filter_result: Optional[Dict[str, Any]] = None
+        
         # Filter input variables
         self.filter_type_var = tk.StringVar(value="amount")
         self.filter_column_var = tk.StringVar()
@@ -114,25 +129,9 @@ class DataAnalyzer(BaseTool):
     def _create_widgets(self):
         """Create all UI widgets."""
         # Main container with scrolling
-        main_canvas = tk.Canvas(self, highlightthickness=0)
-        main_scrollbar = ttk.Scrollbar(self, orient="vertical", command=main_canvas.yview)
-        self.main_frame = ttk.Frame(main_canvas, padding="10")
-        
-        self.main_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
-        
-        main_canvas.create_window((0, 0), window=self.main_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=main_scrollbar.set)
-        
-        main_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        main_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Enable mousewheel scrolling
-        def on_mousewheel(event):
-            main_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        main_canvas.bind_all("<MouseWheel>", on_mousewheel)
+        scrolled = ScrolledFrame(self, padding="10")
+        scrolled.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.main_frame = scrolled.inner
         
         # Header with back button
         self.create_header("Data Analysis Tool")
@@ -344,44 +343,94 @@ class DataAnalyzer(BaseTool):
     # =========================================================================
     
     def _on_file_selected(self, path: str):
-        """Handle file selection - load and preview."""
+        """Handle file selection - preview now, load in the background."""
         try:
-            self._show_status("Loading file...")
-            
-            # Load file into engine
-            self.columns = self.engine.load_csv(path, self.input_table)
-            
-            # Update input preview
-            self.update_preview(
-                self.input_preview_tree,
-                self.input_table,
-                self.columns,
-                limit=5
-            )
-            
-            # Update column dropdowns
-            self.column_combo['values'] = self.columns
-            self.amount_col_combo['values'] = self.columns
-            
-            # Auto-detect amount column
-            amount_col = self.detect_amount_column(self.input_table)
-            if amount_col:
-                self.amount_col_var.set(amount_col)
-            elif self.columns:
-                self.amount_col_var.set(self.columns[0])
-            
-            if self.columns:
-                self.filter_column_var.set(self.columns[0])
-            
-            row_count = self.engine.get_row_count(self.input_table)
-            self.total_records_label.config(text=f"Total Records: {row_count:,}")
-            self._show_status(f"Loaded: {row_count:,} rows, {len(self.columns)} columns")
-            
-            # Clear previous filters
-            self._clear_filters()
-            
+            # Header and first rows only; nothing is loaded yet
+            self.columns, preview_rows = self.engine.peek_csv(path, n=5)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load file: {e}")
+            return
+        
+        self._load_count += 1
+        self._filter_signature = None
+        self._filter_result = None
+        self.column_types = {}
+        self._loading = True
+        self._after_load = None
+        
+        # Update input preview
+        self.show_preview_rows(self.input_preview_tree, self.columns, preview_rows)
+        
+        # Update column dropdowns
+        self.column_combo['values'] = self.columns
+        self.amount_col_combo['values'] = self.columns
+        
+        # Auto-detect amount column
+        amount_col = self.detect_column_local(self.columns, self._amount_re)
+        if amount_col:
+            self.amount_col_var.set(amount_col)
+        elif self.columns:
+            self.amount_col_var.set(self.columns[0])
+        
+        if self.columns:
+            self.filter_column_var.set(self.columns[0])
+        
+        # Clear previous filters
+        self._clear_filters()
+        self.total_records_label.config(text="Total Records: ...")
+        
+        load_count = self._load_count
+        self.run_threaded(
+            self._load_input,
+            lambda columns: self._on_load_complete(load_count),
+            lambda e: self._on_load_failed(load_count, e),
+            "Loading file...",
+            path,
+            load_count
+        )
+    
+    def _load_input(self, path: str, load_count: int) -> Optional[List[str]]:
+        """Load the selected file into input_table unless a newer file was chosen."""
+        with self._load_lock:
+            if load_count != self._load_count:
+                return None
+            # From the file's Parquet copy when caching is on and it was opened before
+            return self.engine.load_csv_cached(path, self.input_table)
+    
+    def _on_load_complete(self, load_count: int):
+        """Show the loaded row count and run any action waiting for the load."""
+        if load_count != self._load_count:
+            return
+        self._loading = False
+        self.column_types = {
+            col['name']: col['type'] for col in self.engine.get_schema_info(self.input_table)
+        }
+        
+        row_count = self.engine.get_row_count(self.input_table)
+        self.total_records_label.config(text=f"Total Records: {row_count:,}")
+        self._show_status(f"Loaded: {row_count:,} rows, {len(self.columns)} columns")
+        
+        action, self._after_load = self._after_load, None
+        if action:
+            action()
+    
+    def _on_load_failed(self, load_count: int, error: Exception):
+        """Report a failed background load."""
+        if load_count != self._load_count:
+            return
+        self._loading = False
+        self._after_load = None
+        self.columns = []
+        self.total_records_label.config(text="Total Records: 0")
+        messagebox.showerror("Error", f"Failed to load file: {error}")
+    
+    def _defer_until_loaded(self, action: Callable) -> bool:
+        """Queue an action to run once the background load finishes, if one is running."""
+        if not self._loading:
+            return False
+        self._after_load = action
+        self._show_status("Waiting for the file to finish loading...")
+        return True
     
     # =========================================================================
     # Filter Management
@@ -421,16 +470,34 @@ class DataAnalyzer(BaseTool):
             messagebox.showwarning("Missing Input", "Please enter a 'To' value")
             return
         
+        # Range filters on text columns would compare strings, not numbers
+        column_type = self.column_types.get(column)
+        if filter_type == 'amount' and column_type and not column_type.startswith(self.NUMERIC_TYPES):
+            messagebox.showwarning(
+                "Invalid Column",
+                f"'{column}' holds {column_type} values; amount ranges need a numeric column"
+            )
+            return
+        
         # Parse values based on type
         try:
             if filter_type == 'amount':
                 from_val = float(from_val)
                 to_val = float(to_val)
-            # Date and text remain as strings
         except ValueError:
             messagebox.showwarning("Invalid Input", "Amount values must be numbers")
             return
         
+        # Bounds on typed date columns are parsed once here, so the engine compares
+        # dates directly; dates held as text keep comparing as strings
+        if filter_type == 'date' and column_type and column_type.startswith(("DATE", "TIMESTAMP")):
+            try:
+                from_val = date.fromisoformat(from_val)
+                to_val = date.fromisoformat(to_val)
+            except ValueError:
+                messagebox.showwarning("Invalid Input", "Date values must be YYYY-MM-DD")
+                return
+        
         # Create filter
         filter_range = FilterRange(
             filter_type=filter_type,
@@ -481,6 +548,8 @@ class DataAnalyzer(BaseTool):
         if not self.columns:
             messagebox.showwarning("No Data", "Please load a file first")
             return
+        if self._defer_until_loaded(self._apply_filters):
+            return
         
         self.run_threaded(
             self._run_filter,
@@ -493,25 +562,39 @@ class DataAnalyzer(BaseTool):
         conditions = self.filter_manager.get_conditions()
         combine_mode = self.combine_mode_var.get()
         
-        # Apply filter
-        self.filter_manager.combine_mode = combine_mode
-        row_count = self.engine.filter_data(
-            self.input_table,
-            conditions,
-            self.filtered_table,
-            combine_mode
+        amount_col = self.amount_col_var.get()
+        signature = (
+            self._load_count,
+            tuple((f.filter_type, f.column, f.min_val, f.max_val) for f in self.filter_manager.filters),
+            combine_mode,
+            amount_col
         )
+        if signature == self._filter_signature:
+            return self._filter_result
+        
+        # Apply filter (unless only the analyzed column changed)
+        self.filter_manager.combine_mode = combine_mode
+        if self._filter_signature is not None and signature[:3] == self._filter_signature[:3]:
+            row_count = self._filter_result['row_count']
+        else:
+            row_count = self.engine.filter_data(
+                self.input_table,
+                conditions,
+                self.filtered_table,
+                combine_mode
+            )
         
         # Calculate statistics on amount column
-        amount_col = self.amount_col_var.get()
         stats = {}
         if amount_col:
             stats = self.engine.get_statistics(self.filtered_table, amount_col)
         
-        return {
+        self._filter_signature = signature
+        self._filter_result = {
             'row_count': row_count,
             'stats': stats
         }
+        return self._filter_result
     
     def _on_filter_complete(self, result: Dict[str, Any]):
         """Handle filter completion."""
@@ -549,29 +632,38 @@ class DataAnalyzer(BaseTool):
             messagebox.showwarning("No Data", "Please load a file first")
             return
         
-        try:
-            # Check if filtered table exists
-            self.engine.get_row_count(self.filtered_table)
-        except:
-            # Run filter first
+        if self._defer_until_loaded(self._export_filtered):
+            return
+        
+        if self._filter_result is None:
+            # Nothing filtered yet: filtered_table does not exist
             self._run_filter()
         
         # Prompt for output file
         output_path = filedialog.asksaveasfilename(
             title="Save Filtered Data",
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("All files", "*.*")]
         )
         
         if not output_path:
             return
         
-        try:
-            row_count = self.engine.export_table(self.filtered_table, output_path)
+        def on_complete(row_count: int):
             messagebox.showinfo(
                 "Export Complete",
                 f"Exported {row_count:,} rows to:\n{output_path}"
             )
             self._show_status(f"Exported: {output_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        
+        # DuckDB writes straight from the filtered table; no rows pass through Python
+        file_format = "parquet" if output_path.lower().endswith(".parquet") else "csv"
+        self.run_threaded(
+            self.engine.export_table,
+            on_complete,
+            lambda e: messagebox.showerror("Export Error", str(e)),
+            "Exporting filtered data...",
+            self.filtered_table,
+            output_path,
+            file_format
+        )
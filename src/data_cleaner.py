@@ -1,9 +1,10 @@
 """Data Cleaning Tool for standardizing data formats and types."""
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Dict, Optional, Any
-from base_tool import BaseTool
+from typing import List, Dict, Optional, Any, Tuple
+from base_tool import BaseTool, ScrolledFrame
 
 
 class DataCleaner(BaseTool):
@@ -27,6 +28,15 @@ class DataCleaner(BaseTool):
         "Boolean": []
     }
     
+    # Type names and format options as tuples, ready for Combobox values
+    TYPE_NAMES = tuple(DATA_TYPES)
+    FORMATS_BY_TYPE = {name: tuple(formats) for name, formats in DATA_TYPES.items()}
+    
+    # Configuration grid columns and include glyphs
+    CONFIG_COLUMNS = ("include", "name", "type", "format")
+    INCLUDE_ON = "☑"
+    INCLUDE_OFF = "☐"
+    
     def __init__(self, parent: tk.Widget, controller=None, on_back=None):
         """Initialize the Data Cleaning Tool."""
         super().__init__(parent, controller, on_back)
@@ -37,40 +47,43 @@ class DataCleaner(BaseTool):
         self.cleaned_table = "cleaned_output"
         self.columns: List[str] = []
         
+        # Selected file as (generation, path); generation increases with
+        # every selection, and input_table holds _loaded_generation's file.
+        # _load_lock is held while input_table is loaded or read for cleaning.
+        self._current_file: Optional[Tuple[int, str]] = None
+        self._file_generation = 0
+        self._loaded_generation: Optional[int] = None
+        self._load_lock = threading.Lock()
+        
         # Column configuration storage
-        # List of dicts: {name, type, format, include}
-        self.column_configs: List[Dict[str, Any]] = []
+        # Maps config grid item ids to column names; include/type/format
+        # are read straight from the grid
+        self.column_configs: Dict[str, str] = {}
+        
+        # Cleaning SELECTs, keyed by file generation and column settings
+        self._clean_sql_cache: Dict[tuple, str] = {}
+        
+        # File generation and settings that built cleaned_table, if still current
+        self._cleaned_key: Optional[tuple] = None
+        
+        # _guess_type results, keyed by (column name, DuckDB type)
+        self._type_guesses: Dict[Tuple[str, str], str] = {}
         
         # UI references
         self.input_preview_tree: Optional[ttk.Treeview] = None
         self.output_preview_tree: Optional[ttk.Treeview] = None
-        self.config_frame: Optional[ttk.Frame] = None
-        self.config_widgets: List[Dict[str, tk.Widget]] = []
+        self.config_tree: Optional[ttk.Treeview] = None
+        self._config_editor: Optional[ttk.Combobox] = None
+        self._editing_cell: Optional[Tuple[str, str]] = None
         
         self._create_widgets()
     
     def _create_widgets(self):
         """Create all UI widgets."""
         # Main scrollable container
-        main_canvas = tk.Canvas(self, highlightthickness=0)
-        main_scrollbar = ttk.Scrollbar(self, orient="vertical", command=main_canvas.yview)
-        self.main_frame = ttk.Frame(main_canvas, padding="10")
-        
-        self.main_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
-        
-        main_canvas.create_window((0, 0), window=self.main_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=main_scrollbar.set)
-        
-        main_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        main_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Enable mousewheel scrolling
-        def on_mousewheel(event):
-            main_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        main_canvas.bind_all("<MouseWheel>", on_mousewheel)
+        scrolled = ScrolledFrame(self, padding="10")
+        scrolled.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.main_frame = scrolled.inner
         
         # Header with back button
         self.create_header("Data Cleaning Tool")
@@ -116,33 +129,42 @@ class DataCleaner(BaseTool):
         )
         config_container.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        # Header row
-        header_frame = ttk.Frame(config_container)
-        header_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        ttk.Label(header_frame, text="Include", width=8, anchor="center").pack(side=tk.LEFT, padx=2)
-        ttk.Label(header_frame, text="Column Name", width=20, anchor="w").pack(side=tk.LEFT, padx=2)
-        ttk.Label(header_frame, text="Data Type", width=12, anchor="center").pack(side=tk.LEFT, padx=2)
-        ttk.Label(header_frame, text="Format", width=15, anchor="center").pack(side=tk.LEFT, padx=2)
-        
-        # Separator
-        ttk.Separator(config_container, orient="horizontal").pack(fill=tk.X, pady=2)
-        
-        # Scrollable frame for column rows
-        config_canvas = tk.Canvas(config_container, height=200, highlightthickness=0)
-        config_scrollbar = ttk.Scrollbar(config_container, orient="vertical", command=config_canvas.yview)
-        self.config_frame = ttk.Frame(config_canvas)
-        
-        self.config_frame.bind(
-            "<Configure>",
-            lambda e: config_canvas.configure(scrollregion=config_canvas.bbox("all"))
+        # One Treeview row per column keeps the widget count constant
+        # however wide the input file is
+        self.config_tree = ttk.Treeview(
+            config_container,
+            columns=self.CONFIG_COLUMNS,
+            show="headings",
+            height=10,
+            selectmode="none"
         )
-        
-        config_canvas.create_window((0, 0), window=self.config_frame, anchor="nw")
-        config_canvas.configure(yscrollcommand=config_scrollbar.set)
+        headings = {
+            "include": ("Include", 70, "center"),
+            "name": ("Column Name", 220, "w"),
+            "type": ("Data Type", 120, "center"),
+            "format": ("Format", 140, "center"),
+        }
+        for col, (text, width, anchor) in headings.items():
+            self.config_tree.heading(col, text=text)
+            self.config_tree.column(col, width=width, anchor=anchor, stretch=(col == "name"))
+        
+        config_scrollbar = ttk.Scrollbar(
+            config_container,
+            orient="vertical",
+            command=self._scroll_config_tree
+        )
+        self.config_tree.configure(yscrollcommand=config_scrollbar.set)
         
         config_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        config_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.config_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.config_tree.bind("<Button-1>", self._on_config_click)
+        self.config_tree.bind("<MouseWheel>", lambda e: self._close_config_editor())
+        
+        # One combobox, placed over whichever Type/Format cell is being edited
+        self._config_editor = ttk.Combobox(self.config_tree, state="readonly")
+        self._config_editor.bind("<<ComboboxSelected>>", self._commit_config_edit)
+        self._config_editor.bind("<Escape>", lambda e: self._close_config_editor())
     
     def _create_action_buttons(self):
         """Create action buttons."""
@@ -181,126 +203,161 @@ class DataCleaner(BaseTool):
         ).pack(side=tk.RIGHT, padx=2)
     
     def _on_file_selected(self, path: str):
-        """Handle file selection - load and preview."""
+        """Handle file selection - preview a sample, load on first clean."""
         try:
-            self._show_status("Loading file...")
-            
-            # Load file into engine
-            self.columns = self.engine.load_csv(path, self.input_table)
-            
-            # Update input preview
-            self.update_preview(
-                self.input_preview_tree, 
-                self.input_table, 
-                self.columns,
-                limit=5
-            )
-            
-            # Build column configuration
-            self._build_column_configs()
-            
-            row_count = self.engine.get_row_count(self.input_table)
-            self._show_status(f"Loaded: {row_count:,} rows, {len(self.columns)} columns")
-            
+            # Names, types and a few rows from a sample; the full file is
+            # only read when the data is actually cleaned
+            self.columns, sample_rows, types = self.engine.sniff_csv(path)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load file: {e}")
+            return
+        
+        self._file_generation += 1
+        self._current_file = (self._file_generation, path)
+        self._clean_sql_cache.clear()
+        self._cleaned_key = None
+        
+        # Update input preview
+        self.show_preview_rows(self.input_preview_tree, self.columns, sample_rows[:5])
+        
+        # Build column configuration
+        self._build_column_configs(list(zip(self.columns, types)))
+        
+        # Nothing is loaded yet, so the row count is not known
+        self._show_status(
+            f"Sampled {len(sample_rows):,} rows, {len(self.columns)} columns "
+            "(full file loads on preview or export)"
+        )
     
-    def _build_column_configs(self):
-        """Build column configuration widgets based on loaded columns."""
-        # Clear existing config widgets
-        for widget in self.config_frame.winfo_children():
-            widget.destroy()
-        self.config_widgets = []
-        self.column_configs = []
-        
-        # Get schema info for type hints
-        schema = self.engine.get_schema_info(self.input_table)
-        
-        for i, col_info in enumerate(schema):
-            col_name = col_info['name']
-            col_type = col_info['type']
-            
-            # Create row frame
-            row_frame = ttk.Frame(self.config_frame)
-            row_frame.pack(fill=tk.X, pady=2)
-            
-            # Include checkbox
-            include_var = tk.BooleanVar(value=True)
-            include_cb = ttk.Checkbutton(row_frame, variable=include_var)
-            include_cb.pack(side=tk.LEFT, padx=(0, 10))
-            
-            # Column name
-            name_label = ttk.Label(row_frame, text=col_name, width=20, anchor="w")
-            name_label.pack(side=tk.LEFT, padx=2)
+    def _ensure_loaded(self, generation: int) -> bool:
+        """
+        Load the selected file into input_table unless it is already there.
+        
+        The caller must hold _load_lock and keep holding it while it reads
+        input_table, so another selection cannot replace the data midway.
+        
+        Args:
+            generation: File generation the caller's settings were made for
             
-            # Data type dropdown
-            type_var = tk.StringVar(value=self._guess_type(col_name, col_type))
-            type_combo = ttk.Combobox(
-                row_frame, 
-                textvariable=type_var, 
-                values=list(self.DATA_TYPES.keys()),
-                width=10,
-                state="readonly"
-            )
-            type_combo.pack(side=tk.LEFT, padx=2)
+        Returns:
+            False if a different file has been selected since
+        """
+        current_generation, path = self._current_file
+        if generation != current_generation:
+            return False
+        if self._loaded_generation != generation:
+            self._loaded_generation = None
+            self.engine.load_csv(path, self.input_table)
+            self._loaded_generation = generation
+        return True
+    
+    def _build_column_configs(self, schema: List[Tuple[str, str]]):
+        """
+        Populate the configuration grid.
+        
+        Args:
+            schema: (column name, DuckDB type) pairs used for type hints
+        """
+        self._close_config_editor()
+        self.config_tree.delete(*self.config_tree.get_children())
+        self.column_configs = {}
+        
+        for col_name, db_type in schema:
+            data_type = self._guess_type(col_name, db_type)
             
-            # Format dropdown (updates based on type)
-            format_var = tk.StringVar()
-            format_combo = ttk.Combobox(
-                row_frame,
-                textvariable=format_var,
-                width=13,
-                state="readonly"
+            iid = self.config_tree.insert("", "end", values=(
+                self.INCLUDE_ON,
+                col_name,
+                data_type,
+                self._default_format(data_type)
+            ))
+            self.column_configs[iid] = col_name
+    
+    def _on_config_click(self, event):
+        """Toggle the include glyph or open an editor over the clicked cell."""
+        self._close_config_editor()
+        
+        if self.config_tree.identify_region(event.x, event.y) != "cell":
+            return
+        iid = self.config_tree.identify_row(event.y)
+        if not iid:
+            return
+        col_index = int(self.config_tree.identify_column(event.x)[1:]) - 1
+        column = self.CONFIG_COLUMNS[col_index]
+        
+        if column == "include":
+            current = self.config_tree.set(iid, "include")
+            self.config_tree.set(
+                iid, "include",
+                self.INCLUDE_OFF if current == self.INCLUDE_ON else self.INCLUDE_ON
             )
-            format_combo.pack(side=tk.LEFT, padx=2)
-            
-            # Update format options when type changes
-            def update_formats(event, type_v=type_var, format_c=format_combo, format_v=format_var):
-                selected_type = type_v.get()
-                formats = self.DATA_TYPES.get(selected_type, [])
-                format_c['values'] = formats
-                if formats:
-                    format_v.set(formats[0])
-                else:
-                    format_v.set("")
-            
-            type_combo.bind("<<ComboboxSelected>>", update_formats)
-            
-            # Initialize format options
-            initial_type = type_var.get()
-            formats = self.DATA_TYPES.get(initial_type, [])
-            format_combo['values'] = formats
+        elif column == "type":
+            self._open_config_editor(iid, column, self.TYPE_NAMES)
+        elif column == "format":
+            formats = self.FORMATS_BY_TYPE.get(self.config_tree.set(iid, "type"), ())
             if formats:
-                format_var.set(formats[0])
-            
-            # Store config
-            config = {
-                'name': col_name,
-                'include_var': include_var,
-                'type_var': type_var,
-                'format_var': format_var
-            }
-            self.column_configs.append(config)
-            self.config_widgets.append({
-                'frame': row_frame,
-                'include': include_cb,
-                'type': type_combo,
-                'format': format_combo
-            })
+                self._open_config_editor(iid, column, formats)
+        return "break"
+    
+    def _open_config_editor(self, iid: str, column: str, values: Tuple[str, ...]):
+        """Place the shared cell editor over a Type or Format cell."""
+        bbox = self.config_tree.bbox(iid, column)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        
+        editor = self._config_editor
+        editor.configure(values=values)
+        editor.set(self.config_tree.set(iid, column))
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        self._editing_cell = (iid, column)
+    
+    def _commit_config_edit(self, event):
+        """Write the editor's selection back to the grid."""
+        if self._editing_cell is None:
+            return
+        iid, column = self._editing_cell
+        value = self._config_editor.get()
+        self.config_tree.set(iid, column, value)
+        if column == "type":
+            # Reset the format to the first option for the new type
+            self.config_tree.set(iid, "format", self._default_format(value))
+        self._close_config_editor()
+    
+    def _close_config_editor(self):
+        """Hide the cell editor, if it is open."""
+        if self._editing_cell is not None:
+            self._config_editor.place_forget()
+            self._editing_cell = None
+    
+    def _scroll_config_tree(self, *args):
+        """Scroll the configuration grid, closing any open cell editor."""
+        self._close_config_editor()
+        self.config_tree.yview(*args)
+    
+    def _default_format(self, data_type: str) -> str:
+        """First format option for a data type, or "" if it has none."""
+        formats = self.FORMATS_BY_TYPE.get(data_type, ())
+        return formats[0] if formats else ""
     
     def _guess_type(self, col_name: str, db_type: str) -> str:
         """Guess the appropriate type based on column name and DB type."""
-        col_lower = col_name.lower()
-        
+        key = (col_name, db_type)
+        guess = self._type_guesses.get(key)
+        if guess is None:
+            guess = self._type_guesses[key] = self._guess_type_uncached(col_name, db_type)
+        return guess
+    
+    def _guess_type_uncached(self, col_name: str, db_type: str) -> str:
+        """Guess a column's type without consulting the cache."""
         # Check for date patterns
-        for pattern in self.date_patterns:
-            if pattern in col_lower:
-                return "Date"
+        if self._date_re.search(col_name):
+            return "Date"
         
         # Check for amount patterns
-        for pattern in self.amount_patterns:
-            if pattern in col_lower:
-                return "Number"
+        if self._amount_re.search(col_name):
+            return "Number"
         
         # Check DB type
         if db_type in ['DOUBLE', 'FLOAT', 'INTEGER', 'BIGINT', 'DECIMAL']:
@@ -318,43 +375,39 @@ class DataCleaner(BaseTool):
             messagebox.showwarning("No Data", "Please load a file first")
             return
         
-        for config in self.column_configs:
-            col_name = config['name']
-            
+        for iid, col_name in self.column_configs.items():
             # Try to detect based on column name patterns
             detected_type = "Text"
             
             # Check date patterns
-            if self.detect_column(self.input_table, [col_name.lower()]) and \
-               any(p in col_name.lower() for p in self.date_patterns):
+            if self._date_re.search(col_name):
                 detected_type = "Date"
             # Check amount patterns
-            elif any(p in col_name.lower() for p in self.amount_patterns):
+            elif self._amount_re.search(col_name):
                 detected_type = "Number"
             
-            config['type_var'].set(detected_type)
+            self.config_tree.set(iid, "type", detected_type)
             
             # Update format options
-            formats = self.DATA_TYPES.get(detected_type, [])
-            if formats:
-                config['format_var'].set(formats[0])
+            self.config_tree.set(iid, "format", self._default_format(detected_type))
         
         self._show_status("Auto-detected column types")
     
     def _set_all_includes(self, value: bool):
         """Set all include checkboxes to the given value."""
-        for config in self.column_configs:
-            config['include_var'].set(value)
+        glyph = self.INCLUDE_ON if value else self.INCLUDE_OFF
+        for iid in self.column_configs:
+            self.config_tree.set(iid, "include", glyph)
     
     def _get_current_configs(self) -> List[Dict[str, Any]]:
         """Get current column configurations as list of dicts."""
         configs = []
-        for config in self.column_configs:
+        for iid, col_name in self.column_configs.items():
             configs.append({
-                'name': config['name'],
-                'include': config['include_var'].get(),
-                'type': config['type_var'].get(),
-                'format': config['format_var'].get()
+                'name': col_name,
+                'include': self.config_tree.set(iid, "include") == self.INCLUDE_ON,
+                'type': self.config_tree.set(iid, "type"),
+                'format': self.config_tree.set(iid, "format")
             })
         return configs
     
@@ -366,68 +419,67 @@ class DataCleaner(BaseTool):
         
         self.run_threaded(
             self._clean_data,
-            on_complete=self._on_clean_complete,
-            progress_message="Cleaning data..."
+            self._on_clean_complete,
+            None,
+            "Cleaning data...",
+            self._get_current_configs(),
+            self._file_generation
         )
     
-    def _clean_data(self) -> int:
+    def _clean_data(self, configs: List[Dict[str, Any]], generation: int) -> Optional[int]:
         """
         Clean the data based on column configurations.
         
+        Args:
+            configs: Column configurations from _get_current_configs, read on
+                the UI thread
+            generation: File generation the configurations belong to
+        
         Returns:
-            Number of rows in cleaned output
+            Number of rows in cleaned output, or None if another file was
+            selected in the meantime
         """
-        configs = self._get_current_configs()
-        
         # Validate at least one column is included
         included_cols = [c for c in configs if c['include']]
         if not included_cols:
             raise ValueError("At least one column must be included")
         
-        # Create a working copy
-        working_table = "cleaning_workspace"
-        self.engine.conn.execute(f"""
-            CREATE OR REPLACE TABLE {working_table} AS 
-            SELECT * FROM {self.input_table}
-        """)
-        
-        # Apply transformations
-        for col_config in configs:
-            if not col_config['include']:
-                continue
-            
-            col_name = col_config['name']
-            data_type = col_config['type']
-            format_str = col_config['format']
+        with self._load_lock:
+            if not self._ensure_loaded(generation):
+                return None
             
-            try:
-                if data_type == 'Number':
-                    self.engine.clean_amount_column(working_table, col_name)
-                    if format_str:
-                        precision = len(format_str.split('.')[-1]) if '.' in format_str else 0
-                        self.engine.format_number_output(working_table, col_name, precision)
-                        
-                elif data_type == 'Date':
-                    self.engine.clean_date_column(working_table, col_name)
-                    if format_str:
-                        self.engine.format_date_output(working_table, col_name, format_str)
-                        
-                elif data_type == 'Boolean':
-                    self.engine.clean_boolean_column(working_table, col_name)
-                    
-                # Text requires no transformation
-                
-            except Exception as e:
-                print(f"Warning: Could not clean column {col_name}: {e}")
-        
-        # Select only included columns
-        included_names = [c['name'] for c in configs if c['include']]
-        self.engine.select_columns(working_table, included_names, self.cleaned_table)
-        
-        return self.engine.get_row_count(self.cleaned_table)
+            # Every transformation in one pass over the input
+            sql = self._get_clean_sql(configs, generation)
+            self._cleaned_key = None
+            row_count = self.engine.conn.execute(
+                f"CREATE OR REPLACE TABLE {self.cleaned_table} AS {sql}"
+            ).fetchone()[0]
+            self.engine.mark_schema_changed()
+            # Only while the file is still selected; a newer selection has
+            # already cleared the key on the UI thread
+            if self._current_file[0] == generation:
+                self._cleaned_key = self._settings_key(configs, generation)
+        
+        return row_count
+    
+    @staticmethod
+    def _settings_key(configs: List[Dict[str, Any]], generation: int) -> tuple:
+        """Hashable summary of column settings for one file generation."""
+        return (generation, tuple((c['name'], c['include'], c['type'], c['format']) for c in configs))
     
-    def _on_clean_complete(self, row_count: int):
+    def _get_clean_sql(self, configs: List[Dict[str, Any]], generation: int) -> str:
+        """Cleaning SELECT for the given settings, built once per file and settings."""
+        key = self._settings_key(configs, generation)
+        sql = self._clean_sql_cache.get(key)
+        if sql is None:
+            sql = self._clean_sql_cache[key] = self.engine.build_clean_sql(self.input_table, configs)
+        return sql
+    
+    def _on_clean_complete(self, row_count: Optional[int]):
         """Handle cleaning completion."""
+        if row_count is None:
+            return  # Cleaned a file that is no longer selected
+        
         # Update output preview
         included_cols = [c['name'] for c in self._get_current_configs() if c['include']]
         self.update_preview(
@@ -445,13 +497,6 @@ class DataCleaner(BaseTool):
             messagebox.showwarning("No Data", "Please load a file first")
             return
         
-        # First clean the data
-        try:
-            self._clean_data()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to clean data: {e}")
-            return
-        
         # Prompt for output file
         output_path = filedialog.asksaveasfilename(
             title="Save Cleaned Data",
@@ -462,12 +507,41 @@ class DataCleaner(BaseTool):
         if not output_path:
             return
         
-        try:
-            row_count = self.engine.export_table(self.cleaned_table, output_path)
-            messagebox.showinfo(
-                "Export Complete",
-                f"Exported {row_count:,} rows to:\n{output_path}"
-            )
-            self._show_status(f"Exported: {output_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        # Cleaning may have to load the file first, so it runs off the UI thread
+        self.run_threaded(
+            self._clean_and_export,
+            lambda row_count: self._on_export_complete(output_path, row_count),
+            lambda e: messagebox.showerror("Export Error", str(e)),
+            "Cleaning and exporting...",
+            self._get_current_configs(),
+            self._file_generation,
+            output_path
+        )
+    
+    def _clean_and_export(
+        self,
+        configs: List[Dict[str, Any]],
+        generation: int,
+        output_path: str
+    ) -> int:
+        """Clean the data and write it to output_path, returning the row count."""
+        with self._load_lock:
+            if not self._ensure_loaded(generation):
+                raise ValueError("A different file was selected; export cancelled")
+            
+            # A preview with the same settings already holds the result
+            if self._cleaned_key == self._settings_key(configs, generation):
+                return self.engine.export_table(self.cleaned_table, output_path)
+            
+            # Stream the cleaning projection straight into the file;
+            # cleaned_output is only built for the preview
+            sql = self._get_clean_sql(configs, generation)
+            return self.engine.export_query(sql, output_path)
+    
+    def _on_export_complete(self, output_path: str, row_count: int):
+        """Report a finished export."""
+        messagebox.showinfo(
+            "Export Complete",
+            f"Exported {row_count:,} rows to:\n{output_path}"
+        )
+        self._show_status(f"Exported: {output_path}")
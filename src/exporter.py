@@ -1,8 +1,10 @@
 """Export utilities for reconciliation results."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+import duckdb
 from recon_engine import ReconEngine
 from models import ReconResult
 
@@ -28,13 +30,19 @@ class Exporter:
         """
         self.engine = engine
     
-    def export_table(self, table_name: str, output_dir: str) -> str:
+    def export_table(
+        self,
+        table_name: str,
+        output_dir: str,
+        conn: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> str:
         """
         Export a single result table to CSV.
         
         Args:
             table_name: Name of the table to export
             output_dir: Directory to save the CSV file
+            conn: Engine cursor to run on (for use from worker threads)
             
         Returns:
             Path to the exported file
@@ -43,13 +51,16 @@ class Exporter:
         file_name = self.TABLE_FILE_NAMES.get(table_name, f"{table_name}.csv")
         output_path = os.path.join(output_dir, file_name)
         
-        self.engine.export_table(table_name, output_path)
+        self.engine.export_table(table_name, output_path, conn=conn)
         return output_path
     
     def export_all(self, result: ReconResult) -> Dict[str, str]:
         """
         Export all result tables to CSV files.
         
+        Each table is written concurrently on its own cursor; DuckDB releases
+        the GIL while copying, so the files are written in parallel.
+        
         Args:
             result: ReconResult containing config with output directory
             
@@ -69,11 +80,21 @@ class Exporter:
             result.missing_in_a_table
         ]
         
-        for table_name in tables:
+        def export(table_name: str) -> str:
+            cursor = self.engine.conn.cursor()
             try:
-                path = self.export_table(table_name, output_dir)
-                exported[table_name] = path
-            except Exception as e:
-                print(f"Error exporting {table_name}: {e}")
+                return self.export_table(table_name, output_dir, conn=cursor)
+            finally:
+                cursor.close()
+        
+        with ThreadPoolExecutor(max_workers=min(len(tables), os.cpu_count() or 1)) as executor:
+            futures = {executor.submit(export, t): t for t in tables}
+            for future in as_completed(futures):
+                table_name = futures[future]
+                try:
+                    exported[table_name] = future.result()
+                except Exception as e:
+                    print(f"Error exporting {table_name}: {e}")
         
-        return exported
+        # Report in table order rather than completion order
+        return {t: exported[t] for t in tables if t in exported}
@@ -78,33 +78,34 @@ class HomeScreen(ttk.Frame):
         grid_frame = ttk.Frame(parent)
         grid_frame.pack(expand=True)
         
-        # Create tool buttons in a 2-column grid
-        row = 0
-        col = 0
+        # Configure grid weights for even spacing
+        for i in range(2):
+            grid_frame.grid_columnconfigure(i, weight=1)
+        
+        # Hovering swaps the style instead of reconfiguring the frame's relief.
+        # The styles only carry the relief: ttk::frame takes its padding (and
+        # border width) from the widget options, which would override them.
+        style = ttk.Style(self)
+        style.configure("Tool.TFrame", relief="raised")
+        style.configure("ToolHover.TFrame", relief="groove")
         
-        for tool_id, icon, title, description, enabled in self.TOOLS:
+        # Create tool buttons in a 2-column grid
+        for index, (tool_id, icon, title, description, enabled) in enumerate(self.TOOLS):
             tool_btn = self._create_tool_button(
                 grid_frame,
+                tool_id=tool_id,
                 icon=icon,
                 title=title,
                 description=description,
                 enabled=enabled,
                 command=lambda tid=tool_id: self._on_tool_click(tid)
             )
-            tool_btn.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
-            
-            col += 1
-            if col >= 2:
-                col = 0
-                row += 1
-        
-        # Configure grid weights for even spacing
-        for i in range(2):
-            grid_frame.grid_columnconfigure(i, weight=1)
+            tool_btn.grid(row=index // 2, column=index % 2, padx=15, pady=15, sticky="nsew")
     
     def _create_tool_button(
         self,
         parent: tk.Widget,
+        tool_id: str,
         icon: str,
         title: str,
         description: str,
@@ -116,6 +117,7 @@ class HomeScreen(ttk.Frame):
         
         Args:
             parent: Parent widget
+            tool_id: Tool identifier, used to name the button's binding tag
             icon: Emoji icon
             title: Tool title
             description: Tool description
@@ -126,8 +128,7 @@ class HomeScreen(ttk.Frame):
             Frame containing the button
         """
         # Container frame for the button
-        btn_frame = ttk.Frame(parent, relief="raised", borderwidth=1)
-        btn_frame.configure(padding="20")
+        btn_frame = ttk.Frame(parent, style="Tool.TFrame", borderwidth=1, padding="20")
         
         # Icon (large)
         icon_label = ttk.Label(
@@ -167,17 +168,14 @@ class HomeScreen(ttk.Frame):
         
         # Make the entire frame clickable
         if enabled:
-            # Bind click events to all widgets
+            # One binding tag shared by all widgets of the button, bound once
+            tag = f"tool_{tool_id}"
             for widget in [btn_frame, icon_label, title_label, desc_label]:
-                widget.bind("<Button-1>", lambda e, cmd=command: cmd())
-                widget.bind("<Enter>", lambda e, f=btn_frame: self._on_hover_enter(f))
-                widget.bind("<Leave>", lambda e, f=btn_frame: self._on_hover_leave(f))
-            
-            # Cursor change
-            btn_frame.configure(cursor="hand2")
-            icon_label.configure(cursor="hand2")
-            title_label.configure(cursor="hand2")
-            desc_label.configure(cursor="hand2")
+                widget.bindtags((tag,) + widget.bindtags())
+                widget.configure(cursor="hand2")
+            self.bind_class(tag, "<Button-1>", lambda e: command())
+            self.bind_class(tag, "<Enter>", lambda e: self._on_hover_enter(btn_frame))
+            self.bind_class(tag, "<Leave>", lambda e: self._on_hover_leave(btn_frame))
         else:
             # Dim disabled tools
             icon_label.configure(foreground="gray")
@@ -188,11 +186,11 @@ class HomeScreen(ttk.Frame):
     
     def _on_hover_enter(self, frame: ttk.Frame):
         """Handle mouse enter on tool button."""
-        frame.configure(relief="groove")
+        frame.configure(style="ToolHover.TFrame")
     
     def _on_hover_leave(self, frame: ttk.Frame):
         """Handle mouse leave on tool button."""
-        frame.configure(relief="raised")
+        frame.configure(style="Tool.TFrame")
     
     def _on_tool_click(self, tool_id: str):
         """Handle tool button click."""
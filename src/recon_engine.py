@@ -1,76 +1,426 @@
 """DuckDB-based reconciliation engine."""
 
+import glob
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import duckdb
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from models import ReconConfig, ReconResult, ReconSummary
 
 
+def _char_mask(text: str) -> int:
+    """64-bit signature of the characters present in a lowercase string."""
+    mask = 0
+    for ch in text:
+        mask |= 1 << (ord(ch) & 63)
+    return mask
+
+
+# Table names that may be interpolated into cached statements unquoted
+_TABLE_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote_ident(name: str) -> str:
+    """Quote an identifier for use in SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class PatternSet:
+    """
+    Case-insensitive "contains any of these substrings" matcher for column names.
+    
+    Each pattern keeps a 64-bit character-presence mask. A name whose mask
+    does not cover at least one pattern mask cannot contain that pattern, so
+    most non-matching names are rejected with a few bitwise ANDs before the
+    regex runs.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._regex = re.compile("|".join(map(re.escape, self.patterns)), re.IGNORECASE)
+        self._masks = [_char_mask(p.lower()) for p in self.patterns]
+    
+    def search(self, name: str) -> bool:
+        """Check whether the name contains any of the patterns."""
+        name_mask = _char_mask(name.lower())
+        for mask in self._masks:
+            if name_mask & mask == mask:
+                return self._regex.search(name) is not None
+        return False
+
+
+def compile_patterns(patterns: List[str]) -> PatternSet:
+    """
+    Compile column-name patterns into a single matcher.
+    
+    Args:
+        patterns: Substrings to look for in column names
+        
+    Returns:
+        PatternSet matching any of the substrings (case-insensitive)
+    """
+    return PatternSet(patterns)
+
+
 class ReconEngine:
     """Reconciliation engine using DuckDB for large dataset processing."""
     
-    def __init__(self):
-        """Initialize with in-memory DuckDB connection."""
-        self.conn = duckdb.connect(":memory:")
+    # Map output date format names to strftime patterns
+    DATE_OUTPUT_FORMATS = {
+        "YYYY-MM-DD": "%Y-%m-%d",
+        "DD/MM/YYYY": "%d/%m/%Y",
+        "MM/DD/YYYY": "%m/%d/%Y",
+        "DD-MMM-YYYY": "%d-%b-%Y"
+    }
+    
+    # Parquet copies of CSV files loaded through load_csv_cached, kept in a
+    # per-user cache directory that only the owner can read. Off unless the
+    # engine is created with parquet_cache=True or DATATOOLKIT_PARQUET_CACHE=1
+    # is set in the environment.
+    PARQUET_CACHE_ENABLED = os.environ.get("DATATOOLKIT_PARQUET_CACHE") == "1"
+    PARQUET_CACHE_DIR = os.path.join(
+        os.environ.get("LOCALAPPDATA")
+        or os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache"),
+        "datatoolkit",
+        "parquet"
+    )
+    
+    # Least recently used copies are removed beyond this total size
+    PARQUET_CACHE_MAX_BYTES = 2 * 1024 ** 3
+    
+    def __init__(self, on_disk: bool = False, parquet_cache: Optional[bool] = None):
+        """
+        Initialize the DuckDB connection.
+        
+        Args:
+            on_disk: Keep tables in a temporary database file instead of memory,
+                for inputs too large to hold in RAM. The file is removed on close.
+            parquet_cache: Let load_csv_cached keep Parquet copies of loaded
+                files; defaults to PARQUET_CACHE_ENABLED
+        """
+        self.on_disk = on_disk
+        self.parquet_cache = self.PARQUET_CACHE_ENABLED if parquet_cache is None else parquet_cache
+        self._db_dir = tempfile.mkdtemp(prefix="datatoolkit_") if on_disk else None
+        database = os.path.join(self._db_dir, "engine.duckdb") if on_disk else ":memory:"
+        self.conn = duckdb.connect(database)
         self._source_a_loaded = False
         self._source_b_loaded = False
+        
+        # SQL text for recurring queries, keyed by query kind and arguments
+        self._sql_cache: Dict[tuple, str] = {}
+        
+        # Incremented whenever a table is created or altered
+        self.schema_version = 0
     
-    def load_csv(self, path: str, table_name: str) -> List[str]:
+    def load_csv(self, path: str, table_name: str, columns: Optional[List[str]] = None) -> List[str]:
         """
         Load a CSV file into a DuckDB table.
         
         Args:
             path: Path to the CSV file
             table_name: Name for the table in DuckDB
+            columns: Only load these columns (None loads all); unselected
+                columns are skipped by the reader instead of being parsed
+            
+        Returns:
+            List of column names in the loaded table
+        """
+        columns = self._load_csv_into(self.conn, path, table_name, columns)
+        self._mark_loaded(table_name)
+        self.mark_schema_changed()
+        return columns
+    
+    def create_csv_view(self, paths: List[str], view_name: str) -> List[str]:
+        """
+        Expose one or more CSV files as a single view without loading them.
+        
+        The files are scanned by each query against the view, so nothing is
+        copied into the database and no per-file tables are created. Columns
+        are matched by name, so the files may list them in different orders.
+        
+        Args:
+            paths: CSV files to combine
+            view_name: Name for the view in DuckDB
             
         Returns:
-            List of column names from the CSV
+            List of column names in the view
         """
-        # Use DuckDB's native CSV reader with auto-detection
+        if not paths:
+            raise ValueError("No files provided for view")
+        file_list = ", ".join("'" + str(p).replace("'", "''") + "'" for p in paths)
         self.conn.execute(f"""
+            CREATE OR REPLACE VIEW {view_name} AS
+            SELECT * FROM read_csv_auto([{file_list}], union_by_name=true, parallel=true)
+        """)
+        self.mark_schema_changed()
+        return self.get_columns(view_name)
+    
+    def load_csv_cached(self, path: str, table_name: str) -> List[str]:
+        """
+        Load a CSV file into a DuckDB table, reusing a Parquet copy when possible.
+        
+        Without parquet_cache this is just load_csv. With it, the first load
+        parses the CSV and writes the table to Parquet in PARQUET_CACHE_DIR.
+        Later loads of the same file (same path, size and modification time)
+        read the columnar copy instead, skipping CSV parsing and type sniffing. The directory is private to the user and
+        trimmed to PARQUET_CACHE_MAX_BYTES, least recently used copies first.
+        Caching is best-effort: any problem with the cache falls back to a
+        plain CSV load.
+        
+        Args:
+            path: Path to the CSV file
+            table_name: Name for the table in DuckDB
+            
+        Returns:
+            List of column names in the loaded table
+        """
+        if not self.parquet_cache:
+            return self.load_csv(path, table_name)
+        
+        stat = os.stat(path)
+        path_key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        version_key = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:16]
+        cache_path = os.path.join(self.PARQUET_CACHE_DIR, f"{path_key}-{version_key}.parquet")
+        
+        if os.path.exists(cache_path):
+            try:
+                path_literal = cache_path.replace("'", "''")
+                self.conn.execute(
+                    f"CREATE OR REPLACE TABLE {table_name} AS "
+                    f"SELECT * FROM read_parquet('{path_literal}')"
+                )
+                os.utime(cache_path)  # Mark as recently used
+                self._mark_loaded(table_name)
+                self.mark_schema_changed()
+                return self.get_columns(table_name)
+            except (OSError, duckdb.Error):
+                pass  # Unreadable copy; rebuild it from the CSV
+        
+        columns = self.load_csv(path, table_name)
+        try:
+            os.makedirs(self.PARQUET_CACHE_DIR, mode=0o700, exist_ok=True)
+            os.chmod(self.PARQUET_CACHE_DIR, 0o700)
+            # Drop copies of older versions of this file
+            for stale in glob.glob(os.path.join(self.PARQUET_CACHE_DIR, f"{path_key}-*.parquet")):
+                os.remove(stale)
+            # Written under a temporary name so a half-written copy is never read
+            temp_path = cache_path + ".tmp"
+            self.export_table(table_name, temp_path, file_format="parquet")
+            os.replace(temp_path, cache_path)
+            self._trim_parquet_cache()
+        except (OSError, duckdb.Error):
+            pass
+        return columns
+    
+    def _trim_parquet_cache(self):
+        """Remove the least recently used Parquet copies beyond the size cap."""
+        entries = []
+        for name in os.listdir(self.PARQUET_CACHE_DIR):
+            entry_path = os.path.join(self.PARQUET_CACHE_DIR, name)
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.PARQUET_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(entry_path)
+                total -= size
+            except OSError:
+                pass
+    
+    def load_csvs(self, files: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Load several CSV files concurrently, one cursor per file.
+        
+        DuckDB releases the GIL while reading, so independent files are
+        parsed in parallel rather than one after another.
+        
+        Args:
+            files: Mapping of table name to CSV path
+            
+        Returns:
+            Mapping of table name to its column names
+        """
+        def load(item):
+            table_name, path = item
+            cursor = self.conn.cursor()
+            try:
+                return table_name, self._load_csv_into(cursor, path, table_name)
+            finally:
+                cursor.close()
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(files))) as executor:
+            columns = dict(executor.map(load, files.items()))
+        
+        for table_name in columns:
+            self._mark_loaded(table_name)
+        self.mark_schema_changed()
+        return columns
+    
+    @staticmethod
+    def _load_csv_into(conn, path: str, table_name: str, columns: Optional[List[str]] = None) -> List[str]:
+        """Create a table from a CSV on the given connection or cursor."""
+        select_list = ", ".join(_quote_ident(c) for c in columns) if columns else "*"
+        path_literal = str(path).replace("'", "''")
+        
+        # Use DuckDB's native CSV reader with auto-detection and multi-threaded parsing
+        conn.execute(f"""
             CREATE OR REPLACE TABLE {table_name} AS 
-            SELECT * FROM read_csv_auto('{path}')
+            SELECT {select_list} FROM read_csv_auto('{path_literal}', parallel=true)
         """)
         
         # Get column names
-        result = self.conn.execute(f"DESCRIBE {table_name}").fetchall()
-        columns = [row[0] for row in result]
+        result = conn.execute(f"DESCRIBE {table_name}").fetchall()
+        return [row[0] for row in result]
+    
+    def peek_csv(
+        self,
+        path: str,
+        n: int = 3,
+        conn: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> Tuple[List[str], List[tuple]]:
+        """
+        Read the header and first rows of a CSV file without creating a table.
+        
+        Uses read_csv_auto with a LIMIT, the same reader and sniffer as
+        load_csv, so the returned names (including generated ones for files
+        without a header) always match the columns load_csv will create.
+        
+        Args:
+            path: Path to the CSV file
+            n: Number of data rows to return
+            conn: Cursor of this engine to run on (for use from worker threads)
+            
+        Returns:
+            Tuple of (column names, first n rows)
+        """
+        path_literal = path.replace("'", "''")
+        result = (conn or self.conn).execute(
+            f"SELECT * FROM read_csv_auto('{path_literal}') LIMIT {int(n)}"
+        )
+        columns = [desc[0] for desc in result.description]
+        return columns, result.fetchall()
+    
+    def sniff_csv(
+        self,
+        path: str,
+        nrows: int = 100,
+        sample_size: int = 1024
+    ) -> Tuple[List[str], List[tuple], List[str]]:
+        """
+        Infer a CSV file's schema from a sample without loading it.
+        
+        Types are sniffed from the first sample_size rows only, so they are a
+        guess that a full load may widen (e.g. BIGINT to VARCHAR).
+        
+        Args:
+            path: Path to the CSV file
+            nrows: Number of data rows to return
+            sample_size: Rows the reader inspects to infer types
+        
+        Returns:
+            Tuple of (column names, first nrows rows, inferred type names)
+        """
+        path_literal = path.replace("'", "''")
+        result = self.conn.execute(
+            f"SELECT * FROM read_csv_auto('{path_literal}', sample_size={int(sample_size)}) "
+            f"LIMIT {int(nrows)}"
+        )
+        columns = [desc[0] for desc in result.description]
+        types = [str(desc[1]) for desc in result.description]
+        return columns, result.fetchall(), types
+    
+    def rename_tables(self, renames: Dict[str, str]):
+        """
+        Rename tables in a single transaction, replacing any existing targets.
+        
+        Used to promote already-ingested preview tables to source tables
+        without reading the CSV files again.
+        
+        Args:
+            renames: Mapping of current table name to new table name
+        """
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            for old_name, new_name in renames.items():
+                self.conn.execute(f"DROP TABLE IF EXISTS {new_name}")
+                self.conn.execute(f"ALTER TABLE {old_name} RENAME TO {new_name}")
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
         
+        for new_name in renames.values():
+            self._mark_loaded(new_name)
+        self.mark_schema_changed()
+    
+    def mark_schema_changed(self):
+        """
+        Record that tables were created, replaced or altered.
+        
+        Callers that cache schema-derived results (such as column detection)
+        compare schema_version to know when to recompute. Code that changes
+        tables through conn directly should call this too.
+        """
+        self.schema_version += 1
+    
+    def _mark_loaded(self, table_name: str):
+        """Track whether the reconciliation source tables are present."""
         if table_name == "source_a":
             self._source_a_loaded = True
         elif table_name == "source_b":
             self._source_b_loaded = True
-            
-        return columns
     
     def get_columns(self, table_name: str) -> List[str]:
         """Get column names for a loaded table."""
         result = self.conn.execute(f"DESCRIBE {table_name}").fetchall()
         return [row[0] for row in result]
     
-    def get_row_count(self, table_name: str) -> int:
-        """Get row count for a table."""
-        result = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
+    def get_row_count(self, table_name: str, conn: Optional[duckdb.DuckDBPyConnection] = None) -> int:
+        """Get row count for a table, optionally through a cursor of this engine."""
+        result = (conn or self.conn).execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
         return result[0] if result else 0
     
-    def detect_column(self, table_name: str, patterns: List[str]) -> Optional[str]:
+    def detect_column(self, table_name: str, patterns: Union[List[str], PatternSet]) -> Optional[str]:
         """
         Find first column matching any pattern (case-insensitive).
         
         Args:
             table_name: Name of the table to search
-            patterns: List of patterns to match (substring match)
+            patterns: List of patterns (substring match) or a compile_patterns() matcher
             
         Returns:
             Column name if found, None otherwise
         """
-        columns = self.get_columns(table_name)
-        for col in columns:
-            col_lower = col.lower()
-            for pattern in patterns:
-                if pattern.lower() in col_lower:
-                    return col
-        return None
+        return self.match_column(self.get_columns(table_name), patterns)
+    
+    @staticmethod
+    def match_column(columns: List[str], patterns: Union[List[str], PatternSet]) -> Optional[str]:
+        """
+        Find first column name matching any pattern (case-insensitive).
+        
+        Args:
+            columns: Column names to search
+            patterns: List of patterns (substring match) or a compile_patterns() matcher
+            
+        Returns:
+            Column name if found, None otherwise
+        """
+        if isinstance(patterns, list):
+            patterns = compile_patterns(patterns)
+        search = patterns.search
+        return next((col for col in columns if search(col)), None)
     
     def clean_amount_column(self, table_name: str, column_name: str) -> int:
         """
@@ -89,54 +439,7 @@ class ReconEngine:
         Returns:
             Number of rows affected
         """
-        # First, check if it's already numeric
-        col_type = self.conn.execute(f"""
-            SELECT typeof({column_name}) FROM {table_name} LIMIT 1
-        """).fetchone()
-        
-        if col_type and col_type[0] in ('DOUBLE', 'BIGINT', 'INTEGER', 'FLOAT'):
-            return 0  # Already numeric, no cleaning needed
-        
-        # Create cleaned column, then replace original
-        self.conn.execute(f"""
-            ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS _cleaned_amount DOUBLE
-        """)
-        
-        # Clean the data using SQL transformations
-        # Step 1: Remove all non-numeric chars except . , -
-        # Step 2: Remove commas (thousand separators)
-        # Step 3: Cast to double
-        self.conn.execute(f"""
-            UPDATE {table_name} SET _cleaned_amount = 
-            CASE 
-                -- Handle parentheses for negative numbers: (100) -> -100
-                WHEN TRIM({column_name}) LIKE '(%)'
-                THEN -1 * TRY_CAST(
-                    REPLACE(
-                        regexp_replace(
-                            TRIM(BOTH '()' FROM TRIM({column_name})),
-                            '[^0-9.,-]', '', 'g'
-                        ),
-                        ',', ''
-                    ) AS DOUBLE
-                )
-                ELSE TRY_CAST(
-                    REPLACE(
-                        regexp_replace(
-                            CAST({column_name} AS VARCHAR),
-                            '[^0-9.,-]', '', 'g'
-                        ),
-                        ',', ''
-                    ) AS DOUBLE
-                )
-            END
-        """)
-        
-        # Drop original and rename cleaned
-        self.conn.execute(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
-        self.conn.execute(f"ALTER TABLE {table_name} RENAME COLUMN _cleaned_amount TO {column_name}")
-        
-        return self.get_row_count(table_name)
+        return self.clean_columns(table_name, amount_columns=[column_name])
     
     def clean_date_column(self, table_name: str, column_name: str) -> int:
         """
@@ -160,23 +463,80 @@ class ReconEngine:
         Returns:
             Number of rows affected
         """
-        # Create cleaned column
+        return self.clean_columns(table_name, date_columns=[column_name])
+    
+    def clean_columns(
+        self,
+        table_name: str,
+        amount_columns: Optional[List[str]] = None,
+        date_columns: Optional[List[str]] = None
+    ) -> int:
+        """
+        Clean amount and date columns in a single rewrite of the table.
+        
+        Applies the same rules as clean_amount_column and clean_date_column,
+        but all columns are replaced in place by one CREATE OR REPLACE ...
+        SELECT * REPLACE (...) statement instead of a rewrite per column.
+        Amount columns that are already numeric are left untouched.
+        
+        Args:
+            table_name: Name of the table
+            amount_columns: Columns to convert to numeric amounts
+            date_columns: Columns to normalize to YYYY-MM-DD strings
+            
+        Returns:
+            Number of rows affected (0 if nothing needed cleaning)
+        """
+        column_types = {
+            row[0]: row[1] for row in self.conn.execute(f"DESCRIBE {table_name}").fetchall()
+        }
+        
+        replacements = {}
+        for column_name in amount_columns or []:
+            if column_types.get(column_name) in ('DOUBLE', 'BIGINT', 'INTEGER', 'FLOAT'):
+                continue  # Already numeric, no cleaning needed
+            replacements[column_name] = self._amount_clean_expr(_quote_ident(column_name))
+        for column_name in date_columns or []:
+            replacements[column_name] = self._date_clean_expr(_quote_ident(column_name))
+        
+        if not replacements:
+            return 0
+        
+        replace_list = ",\n".join(
+            f"{expr} AS {_quote_ident(column_name)}" for column_name, expr in replacements.items()
+        )
         self.conn.execute(f"""
-            ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS _cleaned_date VARCHAR
+            CREATE OR REPLACE TABLE {table_name} AS
+            SELECT * REPLACE ({replace_list}) FROM {table_name}
         """)
         
-        # Convert dates to consistent YYYY-MM-DD string format
+        self.mark_schema_changed()
+        return self.get_row_count(table_name)
+    
+    @staticmethod
+    def _amount_clean_expr(col: str) -> str:
+        """SQL expression converting a (quoted) amount column to DOUBLE."""
+        # One vectorized regex pass keeps digits, '.' and '-' (dropping currency
+        # symbols and thousand separators); parentheses only decide the sign,
+        # so (100) -> -100
+        return f"""
+            TRY_CAST(regexp_replace(CAST({col} AS VARCHAR), '[^0-9.-]', '', 'g') AS DOUBLE)
+            * CASE WHEN TRIM(CAST({col} AS VARCHAR)) LIKE '(%)' THEN -1 ELSE 1 END
+        """
+    
+    @staticmethod
+    def _date_clean_expr(col: str) -> str:
+        """SQL expression normalizing a (quoted) date column to a YYYY-MM-DD string."""
         # Intelligently detect DD/MM/YYYY vs MM/DD/YYYY
         # Default to European format (DD/MM/YYYY) for ambiguous dates
-        self.conn.execute(f"""
-            UPDATE {table_name} SET _cleaned_date = 
+        return f"""
             CASE
                 -- Already in YYYY-MM-DD format (starts with 4 digits and hyphen)
-                WHEN CAST({column_name} AS VARCHAR) LIKE '____-__-__'
-                THEN CAST({column_name} AS VARCHAR)
+                WHEN CAST({col} AS VARCHAR) LIKE '____-__-__'
+                THEN CAST({col} AS VARCHAR)
                 
                 -- Slash-separated format (need to detect DD/MM vs MM/DD)
-                WHEN CAST({column_name} AS VARCHAR) LIKE '%/%/%'
+                WHEN CAST({col} AS VARCHAR) LIKE '%/%/%'
                 THEN (
                     SELECT 
                         CASE
@@ -193,22 +553,81 @@ class ReconEngine:
                         END
                     FROM (
                         SELECT 
-                            SPLIT_PART(CAST({column_name} AS VARCHAR), '/', 1) as part1,
-                            SPLIT_PART(CAST({column_name} AS VARCHAR), '/', 2) as part2,
-                            SPLIT_PART(CAST({column_name} AS VARCHAR), '/', 3) as part3
+                            SPLIT_PART(CAST({col} AS VARCHAR), '/', 1) as part1,
+                            SPLIT_PART(CAST({col} AS VARCHAR), '/', 2) as part2,
+                            SPLIT_PART(CAST({col} AS VARCHAR), '/', 3) as part3
                     )
                 )
                 
                 -- Fallback: keep as-is
-                ELSE CAST({column_name} AS VARCHAR)
+                ELSE CAST({col} AS VARCHAR)
             END
-        """)
+        """
+    
+    @staticmethod
+    def _boolean_clean_expr(col: str) -> str:
+        """SQL expression converting a (quoted) Yes/No, 1/0, True/False column to BOOLEAN."""
+        return f"""
+            CASE 
+                WHEN LOWER(TRIM(CAST({col} AS VARCHAR))) IN ('true', 'yes', 'y', '1', 't')
+                THEN TRUE
+                WHEN LOWER(TRIM(CAST({col} AS VARCHAR))) IN ('false', 'no', 'n', '0', 'f')
+                THEN FALSE
+                ELSE NULL
+            END
+        """
+    
+    def build_clean_sql(self, table_name: str, configs: List[dict]) -> str:
+        """
+        Build one SELECT applying the cleaner's column configurations.
         
-        # Drop original and rename cleaned
-        self.conn.execute(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
-        self.conn.execute(f"ALTER TABLE {table_name} RENAME COLUMN _cleaned_date TO {column_name}")
+        Each included column becomes a single expression combining the
+        cleaning and output formatting that clean_amount_column,
+        format_number_output, clean_date_column, format_date_output and
+        clean_boolean_column apply, so the table is read once instead of
+        being rewritten per column. Excluded columns are left out.
         
-        return self.get_row_count(table_name)
+        Args:
+            table_name: Source table
+            configs: Dicts with name, include, type (Text, Number, Date or
+                Boolean) and format keys
+            
+        Returns:
+            SELECT statement producing the cleaned rows
+        """
+        column_types = {
+            row[0]: row[1] for row in self.conn.execute(f"DESCRIBE {table_name}").fetchall()
+        }
+        
+        select_list = []
+        for config in configs:
+            if not config['include']:
+                continue
+            column_name = config['name']
+            format_str = config['format']
+            expr = _quote_ident(column_name)
+            
+            if config['type'] == 'Number':
+                if column_types.get(column_name) not in ('DOUBLE', 'BIGINT', 'INTEGER', 'FLOAT'):
+                    expr = self._amount_clean_expr(expr)
+                if format_str:
+                    precision = len(format_str.split('.')[-1]) if '.' in format_str else 0
+                    expr = f"ROUND(CAST({expr} AS DOUBLE), {precision})"
+            elif config['type'] == 'Date':
+                expr = self._date_clean_expr(expr)
+                if format_str:
+                    strftime_format = self.DATE_OUTPUT_FORMATS.get(format_str, "%Y-%m-%d")
+                    expr = f"strftime(TRY_CAST({expr} AS DATE), '{strftime_format}')"
+            elif config['type'] == 'Boolean':
+                expr = self._boolean_clean_expr(expr)
+            # Text requires no transformation
+            
+            select_list.append(f"{expr} AS {_quote_ident(column_name)}")
+        
+        if not select_list:
+            raise ValueError("At least one column must be included")
+        
+        return f"SELECT {', '.join(select_list)} FROM {table_name}"
     
     def get_column_sum(self, table_name: str, column_name: str) -> Optional[float]:
         """
@@ -229,6 +648,48 @@ class ReconEngine:
         except Exception:
             return None
     
+    def get_column_sums(self, specs: List[Tuple[str, str]]) -> List[Optional[float]]:
+        """
+        Get the sums of several numeric columns in one query.
+        
+        Columns from the same table are summed in a single scan of that table.
+        
+        Args:
+            specs: List of (table_name, column_name) pairs
+            
+        Returns:
+            Sums in the same order as specs, None where a column is not numeric
+        """
+        if not specs:
+            return []
+        
+        by_table: Dict[str, List[str]] = {}
+        for table_name, column_name in specs:
+            columns = by_table.setdefault(table_name, [])
+            if column_name not in columns:
+                columns.append(column_name)
+        
+        key = ("column_sums", tuple((t, tuple(c)) for t, c in by_table.items()))
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            subqueries = []
+            for table_name, columns in by_table.items():
+                sums = ", ".join(f"SUM(TRY_CAST({_quote_ident(c)} AS DOUBLE))" for c in columns)
+                subqueries.append(f"(SELECT {sums} FROM {table_name})")
+            sql = self._sql_cache[key] = f"SELECT * FROM {' CROSS JOIN '.join(subqueries)}"
+        
+        try:
+            row = self.conn.execute(sql).fetchone()
+        except Exception:
+            # Fall back to one query per column so a bad column only affects itself
+            return [self.get_column_sum(t, c) for t, c in specs]
+        
+        positions = {}
+        for table_name, columns in by_table.items():
+            for column_name in columns:
+                positions[(table_name, column_name)] = len(positions)
+        return [row[positions[spec]] for spec in specs]
+    
     def reconcile(self, config: ReconConfig) -> ReconResult:
         """
         Run reconciliation between source_a and source_b.
@@ -327,6 +788,8 @@ class ReconEngine:
             WHERE a.{match_key} IS NULL
         """)
         
+        self.mark_schema_changed()
+        
         # Get counts for summary
         summary = ReconSummary(
             exact_matches=self.get_row_count("exact_matches"),
@@ -338,40 +801,124 @@ class ReconEngine:
         
         return ReconResult(config=config, summary=summary)
     
-    def get_results(self, table_name: str, limit: int = 1000) -> List[tuple]:
+    def get_results(self, table_name: str, limit: int = 1000, offset: int = 0) -> List[tuple]:
         """
         Get results from a result table.
         
         Args:
             table_name: Name of the result table
             limit: Maximum rows to return (for GUI display)
+            offset: Number of rows to skip (for paging through results)
             
         Returns:
             List of tuples containing row data
         """
-        result = self.conn.execute(f"SELECT * FROM {table_name} LIMIT {limit}").fetchall()
+        # The statement text is built once per table; paging only changes the bound values
+        key = ("results", table_name)
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            sql = self._sql_cache[key] = f"SELECT * FROM {table_name} LIMIT ? OFFSET ?"
+        result = self.conn.execute(sql, [int(limit), int(offset)]).fetchall()
         return result
     
+    def preview_rows(
+        self,
+        table_name: str,
+        columns: List[str],
+        limit: int,
+        offset: int = 0,
+        conn: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> List[tuple]:
+        """
+        Fetch a window of rows from selected columns of a table.
+        
+        The statement text is built once per (table, columns) and reused with
+        bound LIMIT/OFFSET values, so preview refreshes skip rebuilding SQL.
+        
+        Args:
+            table_name: Name of the table (plain identifier)
+            columns: Columns to return, in order
+            limit: Maximum rows to return
+            offset: Number of rows to skip
+            conn: Cursor of this engine to run on (for use from worker threads)
+            
+        Returns:
+            List of tuples containing row data
+            
+        Raises:
+            ValueError: If the table name is not a plain identifier
+        """
+        key = ("preview", table_name, tuple(columns))
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            if not _TABLE_NAME_RE.match(table_name):
+                raise ValueError(f"Invalid table name: {table_name!r}")
+            select_list = ", ".join(_quote_ident(c) for c in columns)
+            sql = self._sql_cache[key] = f"SELECT {select_list} FROM {table_name} LIMIT ? OFFSET ?"
+        return (conn or self.conn).execute(sql, [int(limit), int(offset)]).fetchall()
+    
     def get_result_columns(self, table_name: str) -> List[str]:
         """Get column names for a result table."""
         return self.get_columns(table_name)
     
-    def export_table(self, table_name: str, output_path: str) -> int:
+    def export_table(
+        self,
+        table_name: str,
+        output_path: str,
+        file_format: str = "csv",
+        conn: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> int:
         """
-        Export a table to CSV.
+        Export a table to CSV (or Parquet) using DuckDB's native writer.
+        
+        Rows are streamed by COPY straight into the file without passing
+        through Python.
         
         Args:
             table_name: Name of the table to export
-            output_path: Path for the output CSV file
+            output_path: Path for the output file
+            file_format: "csv" (default) or "parquet"
+            conn: Cursor of this engine to run on (for use from worker threads)
             
         Returns:
             Number of rows exported
         """
-        count = self.get_row_count(table_name)
-        self.conn.execute(f"""
-            COPY {table_name} TO '{output_path}' (HEADER, DELIMITER ',')
-        """)
-        return count
+        return self.export_query(f"SELECT * FROM {table_name}", output_path, file_format, conn)
+    
+    def export_query(
+        self,
+        sql: str,
+        output_path: str,
+        file_format: str = "csv",
+        conn: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> int:
+        """
+        Export the result of a query the same way export_table exports a table.
+        
+        The query is streamed straight into the file, so results that are
+        only needed on disk never have to be materialized as a table first.
+        
+        Args:
+            sql: SELECT statement to export
+            output_path: Path for the output file
+            file_format: "csv" (default) or "parquet"
+            conn: Cursor of this engine to run on (for use from worker threads)
+            
+        Returns:
+            Number of rows exported
+        """
+        if file_format == "parquet":
+            options = "FORMAT PARQUET"
+        elif file_format == "csv":
+            options = "FORMAT CSV, HEADER, DELIMITER ','"
+        else:
+            raise ValueError(f"Unsupported export format: {file_format}")
+        
+        path_literal = output_path.replace("'", "''")
+        result = (conn or self.conn).execute(f"""
+            COPY ({sql}) TO '{path_literal}' ({options})
+        """).fetchone()
+        return result[0] if result else 0
     
     # =========================================================================
     # Multi-Tool Support Methods
@@ -419,6 +966,7 @@ class ReconEngine:
         union_query = " UNION ALL ".join(union_parts)
         
         self.conn.execute(f"CREATE OR REPLACE TABLE {output_table} AS {union_query}")
+        self.mark_schema_changed()
         return True
     
     def filter_data(
@@ -445,12 +993,31 @@ class ReconEngine:
         """
         if not conditions:
             # No conditions = copy all data
-            self.conn.execute(f"CREATE OR REPLACE TABLE {output_table} AS SELECT * FROM {table_name}")
-            return self.get_row_count(output_table)
+            row_count = self.conn.execute(
+                f"CREATE OR REPLACE TABLE {output_table} AS SELECT * FROM {table_name}"
+            ).fetchone()[0]
+            self.mark_schema_changed()
+            return row_count
         
         where_parts = []
         params = []
         
+        if combine_mode == "OR":
+            # Several "contains" needles on one column become a single regex,
+            # matched in one pass per value instead of one scan per needle
+            needles: Dict[str, List[str]] = {}
+            for cond in conditions:
+                if cond.get('operator') == 'contains':
+                    needles.setdefault(cond['column'], []).append(str(cond['value']))
+            conditions = [
+                cond for cond in conditions
+                if cond.get('operator') != 'contains' or len(needles[cond['column']]) == 1
+            ]
+            for column, values in needles.items():
+                if len(values) > 1:
+                    where_parts.append(f'regexp_matches(CAST("{column}" AS VARCHAR), ?)')
+                    params.append("|".join(map(re.escape, values)))
+        
         for cond in conditions:
             column = cond['column']
             operator = cond.get('operator', 'equals')
@@ -463,8 +1030,9 @@ class ReconEngine:
                 where_parts.append(f'"{column}" = ?')
                 params.append(value)
             elif operator == 'contains':
-                where_parts.append(f'"{column}" LIKE ?')
-                params.append(f'%{value}%')
+                # Plain substring test: unlike LIKE, '%' and '_' in the value are literal
+                where_parts.append(f'contains(CAST("{column}" AS VARCHAR), ?)')
+                params.append(str(value))
             elif operator == 'gt':
                 where_parts.append(f'"{column}" > ?')
                 params.append(value)
@@ -481,10 +1049,13 @@ class ReconEngine:
         separator = f" {combine_mode} "
         where_clause = separator.join(where_parts)
         
+        # All conditions are evaluated in one vectorized scan; CREATE TABLE AS
+        # reports the number of rows it wrote, so no COUNT(*) pass is needed
         query = f"CREATE OR REPLACE TABLE {output_table} AS SELECT * FROM {table_name} WHERE {where_clause}"
-        self.conn.execute(query, params)
+        row_count = self.conn.execute(query, params).fetchone()[0]
         
-        return self.get_row_count(output_table)
+        self.mark_schema_changed()
+        return row_count
     
     def aggregate_data(
         self, 
@@ -523,17 +1094,31 @@ class ReconEngine:
         
         self.conn.execute(query)
         
-        # Calculate grand total
-        grand_total = self.conn.execute(
-            f'SELECT COUNT(*), SUM("{sum_col}") FROM {table_name}'
+        # Grand totals come from the (much smaller) grouped table rather than
+        # a second scan of the source, which may be a view over CSV files
+        groups, total_records, grand_total = self.conn.execute(
+            f"SELECT COUNT(*), SUM(record_count), SUM(total_amount) FROM {output_table}"
         ).fetchone()
         
+        self.mark_schema_changed()
         return {
-            'row_count': self.get_row_count(output_table),
-            'grand_total': grand_total[1] if grand_total else 0,
-            'total_records': grand_total[0] if grand_total else 0
+            'row_count': groups,
+            'grand_total': grand_total,
+            'total_records': total_records or 0
         }
     
+    def sort_table(self, table_name: str, order_by: str):
+        """
+        Rewrite a table in a new row order.
+        
+        Args:
+            table_name: Table to reorder
+            order_by: ORDER BY clause
+        """
+        self.conn.execute(
+            f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {table_name} ORDER BY {order_by}"
+        )
+    
     def transform_column(
         self, 
         table_name: str, 
@@ -569,6 +1154,7 @@ class ReconEngine:
             """)
             self.conn.execute(f'ALTER TABLE {table_name} DROP COLUMN "{column}"')
             self.conn.execute(f'ALTER TABLE {table_name} RENAME COLUMN _temp_text TO "{column}"')
+            self.mark_schema_changed()
             return self.get_row_count(table_name)
         
         return 0
@@ -595,6 +1181,7 @@ class ReconEngine:
             CREATE OR REPLACE TABLE {output_table} AS
             SELECT {cols_str} FROM {table_name}
         """)
+        self.mark_schema_changed()
         return self.get_row_count(output_table)
     
     def get_schema_info(self, table_name: str) -> List[dict]:
@@ -633,19 +1220,13 @@ class ReconEngine:
         """)
         
         self.conn.execute(f"""
-            UPDATE {table_name} SET _cleaned_bool = 
-            CASE 
-                WHEN LOWER(TRIM(CAST("{column_name}" AS VARCHAR))) IN ('true', 'yes', 'y', '1', 't')
-                THEN TRUE
-                WHEN LOWER(TRIM(CAST("{column_name}" AS VARCHAR))) IN ('false', 'no', 'n', '0', 'f')
-                THEN FALSE
-                ELSE NULL
-            END
+            UPDATE {table_name} SET _cleaned_bool = {self._boolean_clean_expr(_quote_ident(column_name))}
         """)
         
         self.conn.execute(f'ALTER TABLE {table_name} DROP COLUMN "{column_name}"')
         self.conn.execute(f'ALTER TABLE {table_name} RENAME COLUMN _cleaned_bool TO "{column_name}"')
         
+        self.mark_schema_changed()
         return self.get_row_count(table_name)
     
     def format_date_output(
@@ -665,15 +1246,7 @@ class ReconEngine:
         Returns:
             Number of rows affected
         """
-        # Map format strings to strftime patterns
-        format_map = {
-            "YYYY-MM-DD": "%Y-%m-%d",
-            "DD/MM/YYYY": "%d/%m/%Y", 
-            "MM/DD/YYYY": "%m/%d/%Y",
-            "DD-MMM-YYYY": "%d-%b-%Y"
-        }
-        
-        strftime_format = format_map.get(format_str, "%Y-%m-%d")
+        strftime_format = self.DATE_OUTPUT_FORMATS.get(format_str, "%Y-%m-%d")
         
         self.conn.execute(f"""
             ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS _formatted_date VARCHAR
@@ -687,6 +1260,7 @@ class ReconEngine:
         self.conn.execute(f'ALTER TABLE {table_name} DROP COLUMN "{column_name}"')
         self.conn.execute(f'ALTER TABLE {table_name} RENAME COLUMN _formatted_date TO "{column_name}"')
         
+        self.mark_schema_changed()
         return self.get_row_count(table_name)
     
     def format_number_output(
@@ -718,6 +1292,7 @@ class ReconEngine:
         self.conn.execute(f'ALTER TABLE {table_name} DROP COLUMN "{column_name}"')
         self.conn.execute(f'ALTER TABLE {table_name} RENAME COLUMN _formatted_num TO "{column_name}"')
         
+        self.mark_schema_changed()
         return self.get_row_count(table_name)
     
     def get_statistics(self, table_name: str, column_name: str) -> dict:
@@ -753,5 +1328,8 @@ class ReconEngine:
             return {}
     
     def close(self):
-        """Close the database connection."""
+        """Close the database connection (and delete the temporary database file, if any)."""
         self.conn.close()
+        if self._db_dir:
+            shutil.rmtree(self._db_dir, ignore_errors=True)
+            self._db_dir = None
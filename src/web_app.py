@@ -246,6 +246,7 @@ def clean_run():
         
         # Create workspace
         engine.conn.execute("CREATE OR REPLACE TABLE cleaning_workspace AS SELECT * FROM input_data")
+        engine.mark_schema_changed()
         
         configs = session['clean_config']
         
@@ -374,21 +375,22 @@ def aggregate_run():
     
     engine = ReconEngine()
     try:
-        # Load and Union
+        cfg = session['agg_config']
+        group_cols = [cfg['primary_group']] + cfg['additional_groups']
+        # Dedup check
+        group_cols = list(dict.fromkeys(group_cols))
+        
+        # Load and Union - only the grouped and summed columns are read
+        needed_cols = list(dict.fromkeys(group_cols + [cfg['sum_col']]))
         paths = session['agg_paths']
         tables = []
         for i, path in enumerate(paths):
             tname = f"f_{i}"
-            engine.load_csv(path, tname)
+            engine.load_csv(path, tname, columns=needed_cols)
             tables.append(tname)
             
         engine.union_tables(tables, "combined_data")
         
-        cfg = session['agg_config']
-        group_cols = [cfg['primary_group']] + cfg['additional_groups']
-        # Dedup check
-        group_cols = list(dict.fromkeys(group_cols))
-        
         # Sort Logic
         if cfg['sort_by'] == 'total':
             order = "total_amount DESC"
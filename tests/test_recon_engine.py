@@ -0,0 +1,248 @@
+"""Tests for the ReconEngine methods that need no UI."""
+
+import hashlib
+import os
+
+import pytest
+
+from recon_engine import PatternSet, ReconEngine, compile_patterns
+
+
+@pytest.fixture
+def engine():
+    """In-memory engine, closed after the test."""
+    engine = ReconEngine()
+    yield engine
+    engine.close()
+
+
+def write_csv(path, text):
+    """Write CSV text to path and return the path as a string."""
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def messy_csv(tmp_path):
+    """CSV with currency, accounting negatives, mixed dates and yes/no flags."""
+    return write_csv(
+        tmp_path / "messy.csv",
+        'id,Amount,Date,Flag,Note\n'
+        '1,"$1,234.50",13/02/2024,yes,a\n'
+        '2,(100),2024-03-05,N,b\n'
+        '3,200,02/14/2024,1,c\n'
+        '4,x,bad,maybe,d\n'
+    )
+
+
+# =============================================================================
+# Column patterns
+# =============================================================================
+
+def test_compile_patterns_matches_substrings_case_insensitively():
+    patterns = compile_patterns(["amount", "amt"])
+    assert isinstance(patterns, PatternSet)
+    assert patterns.search("Transaction AMOUNT")
+    assert patterns.search("net_amt")
+    assert not patterns.search("Date")
+    assert not patterns.search("")
+
+
+def test_compile_patterns_escapes_regex_characters():
+    patterns = compile_patterns(["a.b", "(x)"])
+    assert patterns.search("col_a.b")
+    assert patterns.search("val (x)")
+    assert not patterns.search("axb")
+
+
+def test_match_column_returns_first_matching_name():
+    patterns = compile_patterns(["date", "dt"])
+    assert ReconEngine.match_column(["id", "Posting Date", "dt"], patterns) == "Posting Date"
+    assert ReconEngine.match_column(["id", "value"], patterns) is None
+
+
+# =============================================================================
+# Cleaning
+# =============================================================================
+
+def test_build_clean_sql_applies_every_column_config(engine, messy_csv):
+    engine.load_csv(messy_csv, "input_data")
+    configs = [
+        {"name": "id", "include": True, "type": "Number", "format": "0.00"},
+        {"name": "Amount", "include": True, "type": "Number", "format": "0.0"},
+        {"name": "Date", "include": True, "type": "Date", "format": "DD-MMM-YYYY"},
+        {"name": "Flag", "include": True, "type": "Boolean", "format": ""},
+        {"name": "Note", "include": False, "type": "Text", "format": ""},
+    ]
+    
+    sql = engine.build_clean_sql("input_data", configs)
+    result = engine.conn.execute(f"{sql} ORDER BY 1")
+    
+    assert [d[0] for d in result.description] == ["id", "Amount", "Date", "Flag"]
+    assert result.fetchall() == [
+        (1.0, 1234.5, "13-Feb-2024", True),
+        (2.0, -100.0, "05-Mar-2024", False),
+        (3.0, 200.0, "14-Feb-2024", True),
+        (4.0, None, None, None),
+    ]
+
+
+def test_build_clean_sql_requires_an_included_column(engine, messy_csv):
+    engine.load_csv(messy_csv, "input_data")
+    configs = [{"name": "id", "include": False, "type": "Text", "format": ""}]
+    with pytest.raises(ValueError):
+        engine.build_clean_sql("input_data", configs)
+
+
+# =============================================================================
+# Filtering and totals
+# =============================================================================
+
+@pytest.fixture
+def notes_table(engine, tmp_path):
+    """Table 'notes' with a free-text column holding LIKE wildcards."""
+    path = write_csv(
+        tmp_path / "notes.csv",
+        "id,note,amount\n"
+        "1,rent paid,10\n"
+        "2,refund 50%,20\n"
+        "3,fee_a,30\n"
+        "4,feeXa,40\n"
+        "5,salary,50\n"
+    )
+    engine.load_csv(path, "notes")
+    return "notes"
+
+
+def ids(engine, table_name):
+    """Sorted id column of a table."""
+    return [row[0] for row in engine.conn.execute(f"SELECT id FROM {table_name} ORDER BY id").fetchall()]
+
+
+def test_filter_data_or_combines_several_needles_on_one_column(engine, notes_table):
+    conditions = [
+        {"column": "note", "operator": "contains", "value": "rent"},
+        {"column": "note", "operator": "contains", "value": "50%"},
+        {"column": "note", "operator": "contains", "value": "fee_a"},
+    ]
+    assert engine.filter_data(notes_table, conditions, "filtered") == 3
+    # '%' and '_' are literal, so 'feeXa' does not match 'fee_a'
+    assert ids(engine, "filtered") == [1, 2, 3]
+
+
+def test_filter_data_mixes_needles_with_other_operators(engine, notes_table):
+    conditions = [
+        {"column": "note", "operator": "contains", "value": "rent"},
+        {"column": "note", "operator": "contains", "value": "salary"},
+        {"column": "amount", "operator": "between", "value": [30, 40]},
+    ]
+    assert engine.filter_data(notes_table, conditions, "filtered") == 4
+    assert ids(engine, "filtered") == [1, 3, 4, 5]
+
+
+def test_filter_data_and_mode_keeps_needles_separate(engine, notes_table):
+    conditions = [
+        {"column": "note", "operator": "contains", "value": "re"},
+        {"column": "note", "operator": "contains", "value": "fund"},
+    ]
+    assert engine.filter_data(notes_table, conditions, "filtered", combine_mode="AND") == 1
+    assert ids(engine, "filtered") == [2]
+
+
+def test_filter_data_without_conditions_copies_the_table(engine, notes_table):
+    assert engine.filter_data(notes_table, [], "filtered") == 5
+
+
+def test_get_column_sums_returns_sums_in_spec_order(engine, notes_table, tmp_path):
+    engine.load_csv(write_csv(tmp_path / "other.csv", "value\n1.5\n2.5\n"), "other")
+    specs = [("other", "value"), ("notes", "amount"), ("notes", "id"), ("notes", "amount")]
+    assert engine.get_column_sums(specs) == [4.0, 150.0, 15.0, 150.0]
+    assert engine.get_column_sums([]) == []
+
+
+def test_get_column_sums_gives_none_for_text_columns(engine, notes_table):
+    assert engine.get_column_sums([("notes", "note"), ("notes", "amount")]) == [None, 150.0]
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_export_query_returns_the_exported_row_count(engine, notes_table, tmp_path, file_format):
+    output_path = str(tmp_path / f"out.{file_format}")
+    count = engine.export_query(
+        f"SELECT * FROM {notes_table} WHERE amount > 20", output_path, file_format=file_format
+    )
+    
+    assert count == 3
+    reader = "read_csv_auto" if file_format == "csv" else "read_parquet"
+    assert engine.conn.execute(f"SELECT COUNT(*) FROM {reader}('{output_path}')").fetchone()[0] == 3
+
+
+def test_export_query_rejects_unknown_formats(engine, notes_table, tmp_path):
+    with pytest.raises(ValueError):
+        engine.export_query(f"SELECT * FROM {notes_table}", str(tmp_path / "out.xlsx"), file_format="xlsx")
+
+
+# =============================================================================
+# Parquet cache
+# =============================================================================
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the Parquet cache at a temporary directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setattr(ReconEngine, "PARQUET_CACHE_DIR", str(path))
+    return path
+
+
+def cache_name(path):
+    """Cache file name load_csv_cached uses for the file's current version."""
+    stat = os.stat(path)
+    path_key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    version_key = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:16]
+    return f"{path_key}-{version_key}.parquet"
+
+
+def test_load_csv_cached_writes_nothing_unless_enabled(engine, messy_csv, cache_dir):
+    assert engine.load_csv_cached(messy_csv, "input_data") == ["id", "Amount", "Date", "Flag", "Note"]
+    assert not cache_dir.exists()
+
+
+def test_load_csv_cached_keys_copies_by_path_and_version(messy_csv, cache_dir):
+    engine = ReconEngine(parquet_cache=True)
+    try:
+        engine.load_csv_cached(messy_csv, "input_data")
+        assert os.listdir(cache_dir) == [cache_name(messy_csv)]
+        
+        # A cache hit loads the same table
+        assert engine.load_csv_cached(messy_csv, "again") == ["id", "Amount", "Date", "Flag", "Note"]
+        assert engine.get_row_count("again") == 4
+        
+        # A changed file replaces the copy of its old version
+        with open(messy_csv, "a", encoding="utf-8") as f:
+            f.write("5,7,2024-01-01,no,e\n")
+        engine.load_csv_cached(messy_csv, "input_data")
+        assert os.listdir(cache_dir) == [cache_name(messy_csv)]
+        assert engine.get_row_count("input_data") == 5
+    finally:
+        engine.close()
+
+
+def test_load_csv_cached_trims_least_recently_used_copies(tmp_path, cache_dir, monkeypatch):
+    engine = ReconEngine(parquet_cache=True)
+    try:
+        first = write_csv(tmp_path / "first.csv", "a,b\n1,2\n")
+        second = write_csv(tmp_path / "second.csv", "a,b\n3,4\n")
+        engine.load_csv_cached(first, "t1")
+        os.utime(cache_dir / cache_name(first), (1, 1))  # Long unused
+        
+        # Room for one copy only
+        first_size = os.path.getsize(cache_dir / cache_name(first))
+        monkeypatch.setattr(ReconEngine, "PARQUET_CACHE_MAX_BYTES", first_size * 3 // 2)
+        engine.load_csv_cached(second, "t2")
+        
+        assert os.listdir(cache_dir) == [cache_name(second)]
+    finally:
+        engine.close()